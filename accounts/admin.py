@@ -1,5 +1,12 @@
+from functools import partial
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from django.db import transaction
+
+from meals import nearby_cache
+from meals.models import Meal
+from .kitchen_index import kitchen_index
 from .models import User, CookProfile, CustomerProfile
 
 
@@ -28,13 +35,27 @@ class CustomUserAdmin(UserAdmin):
     
     @admin.action(description='Disable selected users')
     def disable_users(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = self._set_active(queryset, False)
         self.message_user(request, f'{updated} user(s) disabled.')
     
     @admin.action(description='Enable selected users')
     def enable_users(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = self._set_active(queryset, True)
         self.message_user(request, f'{updated} user(s) enabled.')
+    
+    def _set_active(self, queryset, is_active):
+        """update() skips the User signals, so drop the cook caches they maintain here."""
+        user_ids = list(queryset.values_list('pk', flat=True))
+        updated = User.objects.filter(pk__in=user_ids).update(is_active=is_active)
+        kitchens = set(CookProfile.objects.filter(user_id__in=user_ids).values_list(
+            'kitchen_location_lat', 'kitchen_location_lng'
+        ))
+        if kitchens:
+            transaction.on_commit(kitchen_index.invalidate)
+            for lat, lng in kitchens:
+                transaction.on_commit(partial(nearby_cache.invalidate_kitchen, lat, lng))
+            Meal.objects.filter(cook__user_id__in=user_ids).update_listing()
+        return updated
 
 
 class CookProfileInline(admin.StackedInline):
@@ -0,0 +1,154 @@
+"""
+In-memory spatial index of cook kitchens.
+
+Each worker process keeps a KD-tree of approved, active cooks' kitchen
+coordinates so radius lookups never touch the database. The tree is built
+lazily on first use, dropped by the CookProfile/User signal handlers in
+accounts.signals, and rebuilt after KITCHEN_INDEX_TTL_SECONDS so that
+changes made in other workers are picked up too.
+"""
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from homebite.geo import EARTH_RADIUS_KM
+
+
+def _unit_vectors(lats, lngs):
+    """Project lat/lng degrees onto the unit sphere as an (n, 3) array."""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lngs = np.radians(np.asarray(lngs, dtype=float))
+    return np.column_stack((
+        np.cos(lats) * np.cos(lngs),
+        np.cos(lats) * np.sin(lngs),
+        np.sin(lats),
+    ))
+
+
+class KDTree:
+    """
+    Static 3-d KD-tree over points on the unit sphere.
+
+    Straight-line (chord) distance between unit vectors grows monotonically
+    with great circle distance, so radius queries are exact.
+    """
+
+    LEAF_SIZE = 16
+
+    def __init__(self, ids, lats, lngs):
+        self.ids = np.asarray(ids)
+        self.points = _unit_vectors(lats, lngs)
+        # Each node is (start, end, lower bounds, upper bounds, left, right);
+        # leaves have left == right == None.
+        self.nodes = []
+        self._order = np.arange(len(self.ids))
+        if len(self.ids):
+            self._build(0, len(self.ids))
+        self.ids = self.ids[self._order]
+        self.points = self.points[self._order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _build(self, start, end):
+        points = self.points[self._order[start:end]]
+        lower, upper = points.min(axis=0), points.max(axis=0)
+        node_index = len(self.nodes)
+        self.nodes.append(None)
+
+        left = right = None
+        if end - start > self.LEAF_SIZE:
+            axis = int(np.argmax(upper - lower))
+            self._order[start:end] = self._order[start:end][np.argsort(points[:, axis], kind='stable')]
+            middle = (start + end) // 2
+            left = self._build(start, middle)
+            right = self._build(middle, end)
+
+        self.nodes[node_index] = (start, end, tuple(lower), tuple(upper), left, right)
+        return node_index
+
+    def query_radius(self, lat, lng, radius_km):
+        """Return ``(ids, distances_km)`` of every point within ``radius_km``."""
+        if not self.nodes:
+            return self.ids[:0], np.empty(0)
+
+        query = _unit_vectors([lat], [lng])[0]
+        qx, qy, qz = query
+        angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+        max_chord_sq = (2 * np.sin(angle / 2)) ** 2
+
+        slices = []
+        stack = [0]
+        while stack:
+            start, end, lower, upper, left, right = self.nodes[stack.pop()]
+            gap_sq = 0.0
+            for q, lo, hi in ((qx, lower[0], upper[0]), (qy, lower[1], upper[1]), (qz, lower[2], upper[2])):
+                if q < lo:
+                    gap_sq += (lo - q) ** 2
+                elif q > hi:
+                    gap_sq += (q - hi) ** 2
+            if gap_sq > max_chord_sq:
+                continue
+            if left is None:
+                slices.append((start, end))
+            else:
+                stack.append(left)
+                stack.append(right)
+
+        if not slices:
+            return self.ids[:0], np.empty(0)
+
+        candidates = np.concatenate([np.arange(start, end) for start, end in slices])
+        chord_sq = ((self.points[candidates] - query) ** 2).sum(axis=1)
+        within = chord_sq <= max_chord_sq
+        chords = np.sqrt(chord_sq[within])
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(chords / 2, 1.0))
+        return self.ids[candidates[within]], distances
+
+
+class KitchenIndex:
+    """Process-wide, lazily rebuilt KD-tree of approved, active cook kitchens."""
+
+    def __init__(self):
+        self._tree = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the tree; the next lookup rebuilds it."""
+        self._tree = None
+
+    def _load(self):
+        from .models import CookProfile
+
+        rows = list(CookProfile.objects.filter(
+            user__is_approved=True,
+            user__is_active=True,
+            kitchen_location_lat__isnull=False,
+            kitchen_location_lng__isnull=False
+        ).values_list('id', 'kitchen_location_lat', 'kitchen_location_lng'))
+        ids = [row[0] for row in rows]
+        lats = [row[1] for row in rows]
+        lngs = [row[2] for row in rows]
+        return KDTree(ids, lats, lngs)
+
+    def _get_tree(self):
+        ttl = getattr(settings, 'KITCHEN_INDEX_TTL_SECONDS', 300)
+        tree = self._tree
+        if tree is None or time.monotonic() - self._built_at > ttl:
+            with self._lock:
+                if self._tree is None or time.monotonic() - self._built_at > ttl:
+                    self._tree = self._load()
+                    self._built_at = time.monotonic()
+                tree = self._tree
+        return tree
+
+    def cooks_within(self, lat, lng, radius_km):
+        """Return ``{cook_id: distance_km}`` for kitchens within ``radius_km``."""
+        ids, distances = self._get_tree().query_radius(float(lat), float(lng), radius_km)
+        return dict(zip(ids.tolist(), distances.tolist()))
+
+
+kitchen_index = KitchenIndex()
@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .kitchen_index import kitchen_index
+from .models import CookProfile, User
+
+
+@receiver(post_save, sender=CookProfile)
+@receiver(post_delete, sender=CookProfile)
+def invalidate_kitchen_index_for_cook(sender, instance, **kwargs):
+    """Kitchen moved, signed up or left: rebuild the kitchen index."""
+    kitchen_index.invalidate()
+
+
+@receiver(post_save, sender=User)
+def invalidate_kitchen_index_for_user(sender, instance, update_fields=None, **kwargs):
+    """Cook approval or active state may have changed."""
+    if instance.role != 'cook':
+        return
+    # Logins only touch last_login
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    kitchen_index.invalidate()
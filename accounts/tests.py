@@ -1,3 +1,39 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from homebite.testing import create_cook, create_meal
+from .models import User
+
+
+class UserAdminActionTests(TestCase):
+    """Bulk admin actions must invalidate what the User signals would have."""
+
+    def setUp(self):
+        cook = create_cook(kitchen_location_lat=Decimal('31.52'), kitchen_location_lng=Decimal('74.35'))
+        self.cook_user = cook.user
+        self.meal = create_meal(cook, 'Nihari', price=300)
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client = Client(SERVER_NAME='localhost')
+        self.client.force_login(admin_user)
+
+    def test_disabling_a_cook_invalidates_their_kitchen_and_meals(self):
+        updated_at = self.meal.updated_at
+        with mock.patch('accounts.admin.kitchen_index.invalidate') as invalidate_index, \
+                mock.patch('meals.nearby_cache.invalidate_kitchen') as invalidate_kitchen, \
+                mock.patch('meals.models.suggest_index.invalidate') as invalidate_suggestions, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin:accounts_user_changelist'), {
+                'action': 'disable_users', '_selected_action': [self.cook_user.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+
+        self.cook_user.refresh_from_db()
+        self.meal.refresh_from_db()
+        self.assertFalse(self.cook_user.is_active)
+        self.assertGreater(self.meal.updated_at, updated_at)
+        invalidate_index.assert_called()
+        invalidate_kitchen.assert_called_with(Decimal('31.520000'), Decimal('74.350000'))
+        invalidate_suggestions.assert_called()
@@ -5,10 +5,11 @@ from django.db.models import Count, Sum, Avg, Q, F
 from django.db.models.functions import Sqrt, Power
 from django.utils import timezone
 from datetime import timedelta
-from accounts.models import User, CookProfile
+from accounts.models import User
 from meals.models import Meal
 from orders.models import Order
 from ratings.models import Rating
+from .models import OrderDailyStats, SignupDailyStats
 
 
 @api_view(['GET'])
@@ -17,112 +18,142 @@ def admin_analytics(request):
     """
     Comprehensive admin analytics dashboard
     Returns statistics about users, meals, orders, and ratings
+    
+    Each table is read with a single aggregate() of conditional counts and
+    sums, so the query count is fixed (see analytics.tests) however much
+    data there is.
     """
     
     # User Statistics
-    total_users = User.objects.count()
-    total_cooks = User.objects.filter(role='cook').count()
-    total_customers = User.objects.filter(role='customer').count()
-    approved_cooks = User.objects.filter(role='cook', is_approved=True).count()
-    pending_cooks = User.objects.filter(role='cook', is_approved=False).count()
-    
-    # Recent signups (last 7 days, 30 days)
+    user_stats = User.objects.aggregate(
+        total=Count('id'),
+        cooks=Count('id', filter=Q(role='cook')),
+        customers=Count('id', filter=Q(role='customer')),
+        approved_cooks=Count('id', filter=Q(role='cook', is_approved=True)),
+        pending_cooks=Count('id', filter=Q(role='cook', is_approved=False)),
+    )
+    total_users = user_stats['total']
+    total_cooks = user_stats['cooks']
+    total_customers = user_stats['customers']
+    approved_cooks = user_stats['approved_cooks']
+    pending_cooks = user_stats['pending_cooks']
+    
+    # Order, revenue and signup figures come from the daily rollups (see
+    # analytics.rollups); their windows are whole local days ending today
     today = timezone.now()
     week_ago = today - timedelta(days=7)
     month_ago = today - timedelta(days=30)
+    today_date = timezone.localdate()
+    week_start = today_date - timedelta(days=6)
+    previous_week_start = today_date - timedelta(days=13)
+    month_start = today_date - timedelta(days=29)
     
-    signups_last_7_days = User.objects.filter(date_joined__gte=week_ago).count()
-    signups_last_30_days = User.objects.filter(date_joined__gte=month_ago).count()
+    # Recent signups (last 7 days, 30 days)
+    signups = SignupDailyStats.objects.aggregate(
+        last_7_days=Sum('signups', filter=Q(date__gte=week_start), default=0),
+        last_30_days=Sum('signups', filter=Q(date__gte=month_start), default=0),
+    )
+    signups_last_7_days = signups['last_7_days']
+    signups_last_30_days = signups['last_30_days']
     
     # Meal Statistics
-    total_meals = Meal.objects.count()
-    active_meals = Meal.objects.filter(is_active=True).count()
-    inactive_meals = Meal.objects.filter(is_active=False).count()
-    meals_with_dinein = Meal.objects.filter(dine_with_us_available=True).count()
+    meal_stats = Meal.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        with_dinein=Count('id', filter=Q(dine_with_us_available=True)),
+        last_7_days=Count('id', filter=Q(created_at__gte=week_ago)),
+        last_30_days=Count('id', filter=Q(created_at__gte=month_ago)),
+    )
+    total_meals = meal_stats['total']
+    active_meals = meal_stats['active']
+    inactive_meals = total_meals - active_meals
+    meals_with_dinein = meal_stats['with_dinein']
     
     # Meals created recently
-    meals_last_7_days = Meal.objects.filter(created_at__gte=week_ago).count()
-    meals_last_30_days = Meal.objects.filter(created_at__gte=month_ago).count()
+    meals_last_7_days = meal_stats['last_7_days']
+    meals_last_30_days = meal_stats['last_30_days']
     
     # Order Statistics
-    total_orders = Order.objects.count()
-    pending_orders = Order.objects.filter(status='pending').count()
-    confirmed_orders = Order.objects.filter(status='confirmed').count()
-    ready_orders = Order.objects.filter(status='ready').count()
-    completed_orders = Order.objects.filter(status='completed').count()
-    cancelled_orders = Order.objects.filter(status='cancelled').count()
+    delivery_types = [delivery_type for delivery_type, _ in Order.DELIVERY_TYPE_CHOICES]
+    order_stats = OrderDailyStats.objects.aggregate(
+        all_orders=Sum('orders', default=0),
+        all_completed=Sum('completed', default=0),
+        all_cancelled=Sum('cancelled', default=0),
+        today=Sum('orders', filter=Q(date=today_date), default=0),
+        last_7_days=Sum('orders', filter=Q(date__gte=week_start), default=0),
+        previous_week=Sum(
+            'orders', filter=Q(date__gte=previous_week_start, date__lt=week_start), default=0
+        ),
+        last_30_days=Sum('orders', filter=Q(date__gte=month_start), default=0),
+        all_revenue=Sum('revenue', default=0),
+        revenue_last_7_days=Sum('revenue', filter=Q(date__gte=week_start), default=0),
+        revenue_last_30_days=Sum('revenue', filter=Q(date__gte=month_start), default=0),
+        **{
+            f'{delivery_type}_{counter}': Sum(counter, filter=Q(delivery_type=delivery_type), default=0)
+            for delivery_type in delivery_types
+            for counter in ('orders', 'completed', 'cancelled')
+        }
+    )
+    # Open orders are not rolled up, so they are counted directly
+    open_orders = Order.objects.filter(status__in=['pending', 'confirmed', 'ready']).aggregate(
+        pending=Count('id', filter=Q(status='pending')),
+        confirmed=Count('id', filter=Q(status='confirmed')),
+        ready=Count('id', filter=Q(status='ready')),
+    )
+    total_orders = order_stats['all_orders']
+    pending_orders = open_orders['pending']
+    confirmed_orders = open_orders['confirmed']
+    ready_orders = open_orders['ready']
+    completed_orders = order_stats['all_completed']
+    cancelled_orders = order_stats['all_cancelled']
     
     # Orders by type
-    pickup_orders = Order.objects.filter(delivery_type='pickup').count()
-    delivery_orders = Order.objects.filter(delivery_type='delivery').count()
-    dinein_orders = Order.objects.filter(delivery_type='dine_in').count()
+    pickup_orders = order_stats['pickup_orders']
+    delivery_orders = order_stats['delivery_orders']
+    dinein_orders = order_stats['dine_in_orders']
     
     # Recent orders
-    orders_last_7_days = Order.objects.filter(created_at__gte=week_ago).count()
-    orders_last_30_days = Order.objects.filter(created_at__gte=month_ago).count()
-    orders_today = Order.objects.filter(created_at__date=today.date()).count()
+    orders_last_7_days = order_stats['last_7_days']
+    orders_last_30_days = order_stats['last_30_days']
+    orders_today = order_stats['today']
     
     # Revenue Statistics (completed orders only)
-    total_revenue = Order.objects.filter(status='completed').aggregate(
-        total=Sum('total_price')
-    )['total'] or 0
-    
-    revenue_last_7_days = Order.objects.filter(
-        status='completed',
-        created_at__gte=week_ago
-    ).aggregate(total=Sum('total_price'))['total'] or 0
-    
-    revenue_last_30_days = Order.objects.filter(
-        status='completed',
-        created_at__gte=month_ago
-    ).aggregate(total=Sum('total_price'))['total'] or 0
+    total_revenue = order_stats['all_revenue']
+    revenue_last_7_days = order_stats['revenue_last_7_days']
+    revenue_last_30_days = order_stats['revenue_last_30_days']
     
     # Rating Statistics
-    total_ratings = Rating.objects.count()
-    avg_meal_rating = Rating.objects.aggregate(avg=Avg('meal_rating'))['avg'] or 0
-    avg_cook_rating = Rating.objects.aggregate(avg=Avg('cook_rating'))['avg'] or 0
-    
-    # Ratings distribution
-    ratings_5_star = Rating.objects.filter(
-        Q(meal_rating=5) | Q(cook_rating=5)
-    ).count()
-    ratings_4_star = Rating.objects.filter(
-        Q(meal_rating=4) | Q(cook_rating=4)
-    ).count()
-    ratings_3_star = Rating.objects.filter(
-        Q(meal_rating=3) | Q(cook_rating=3)
-    ).count()
-    ratings_2_star = Rating.objects.filter(
-        Q(meal_rating=2) | Q(cook_rating=2)
-    ).count()
-    ratings_1_star = Rating.objects.filter(
-        Q(meal_rating=1) | Q(cook_rating=1)
-    ).count()
+    rating_stats = Rating.objects.aggregate(
+        total=Count('id'),
+        avg_meal_rating=Avg('meal_rating'),
+        avg_cook_rating=Avg('cook_rating'),
+        **{
+            # Ratings distribution
+            f'{stars}_star': Count('id', filter=Q(meal_rating=stars) | Q(cook_rating=stars))
+            for stars in range(1, 6)
+        }
+    )
+    total_ratings = rating_stats['total']
+    avg_meal_rating = rating_stats['avg_meal_rating'] or 0
+    avg_cook_rating = rating_stats['avg_cook_rating'] or 0
     
     # Top performers
-    top_cooks = User.objects.filter(role='cook').order_by('-cook_profile__rating')[:5]
+    top_cooks = User.objects.filter(role='cook').select_related('cook_profile').order_by(
+        '-cook_profile__rating'
+    )[:5]
     top_cooks_data = []
     for cook in top_cooks:
-        try:
-            cook_profile = cook.cook_profile
-            top_cooks_data.append({
-                'id': cook.id,
-                'username': cook.username,
-                'email': cook.email,
-                'rating': float(cook_profile.rating) if cook_profile else 0,
-                'total_reviews': cook_profile.total_ratings if cook_profile else 0,
-            })
-        except:
-            top_cooks_data.append({
-                'id': cook.id,
-                'username': cook.username,
-                'email': cook.email,
-                'rating': 0,
-                'total_reviews': 0,
-            })
+        cook_profile = getattr(cook, 'cook_profile', None)
+        top_cooks_data.append({
+            'id': cook.id,
+            'username': cook.username,
+            'email': cook.email,
+            'rating': float(cook_profile.rating) if cook_profile else 0,
+            'total_reviews': cook_profile.total_ratings if cook_profile else 0,
+        })
     
     # Most popular meals
-    popular_meals = Meal.objects.annotate(
+    popular_meals = Meal.objects.select_related('cook__user').annotate(
         order_count=Count('orders')
     ).order_by('-order_count')[:5]
     
@@ -158,11 +189,7 @@ def admin_analytics(request):
     # ============================================================
     
     # METRIC 1: Number of Orders (with trends)
-    two_weeks_ago = today - timedelta(days=14)
-    orders_previous_week = Order.objects.filter(
-        created_at__gte=two_weeks_ago,
-        created_at__lt=week_ago
-    ).count()
+    orders_previous_week = order_stats['previous_week']
     
     # Calculate week-over-week growth
     if orders_previous_week > 0:
@@ -171,47 +198,41 @@ def admin_analytics(request):
         orders_growth_rate = 100 if orders_last_7_days > 0 else 0
     
     # Successful orders (completed, not cancelled)
-    successful_orders = Order.objects.filter(status='completed').count()
+    successful_orders = completed_orders
     order_success_rate = (successful_orders / total_orders * 100) if total_orders > 0 else 0
     
     # METRIC 2: Cook Retention Rate (Weekly Active Cooks)
     # A cook is "active" if they received at least one order in the past 7 days
-    weekly_active_cooks = CookProfile.objects.filter(
-        received_orders__created_at__gte=week_ago
-    ).distinct().count()
-    
-    # Previous week active cooks for comparison
-    previous_week_active_cooks = CookProfile.objects.filter(
-        received_orders__created_at__gte=two_weeks_ago,
-        received_orders__created_at__lt=week_ago
-    ).distinct().count()
+    # One row per cook that has ever received an order
+    cook_activity = list(
+        OrderDailyStats.objects.filter(orders__gt=0)
+        .values('cook_id')
+        .annotate(
+            this_week=Sum('orders', filter=Q(date__gte=week_start), default=0),
+            previous_week=Sum(
+                'orders', filter=Q(date__gte=previous_week_start, date__lt=week_start), default=0
+            ),
+            this_month=Sum('orders', filter=Q(date__gte=month_start), default=0),
+        )
+        .order_by()
+    )
+    cooks_active_current = {row['cook_id'] for row in cook_activity if row['this_week']}
+    cooks_active_previous = {row['cook_id'] for row in cook_activity if row['previous_week']}
+    weekly_active_cooks = len(cooks_active_current)
+    previous_week_active_cooks = len(cooks_active_previous)
     
     # Cook retention rate: % of cooks from previous week still active this week
     if previous_week_active_cooks > 0:
-        # Get cooks active in both periods
-        cooks_active_previous = set(CookProfile.objects.filter(
-            received_orders__created_at__gte=two_weeks_ago,
-            received_orders__created_at__lt=week_ago
-        ).values_list('id', flat=True).distinct())
-        
-        cooks_active_current = set(CookProfile.objects.filter(
-            received_orders__created_at__gte=week_ago
-        ).values_list('id', flat=True).distinct())
-        
         retained_cooks = len(cooks_active_previous.intersection(cooks_active_current))
-        cook_retention_rate = (retained_cooks / len(cooks_active_previous)) * 100
+        cook_retention_rate = (retained_cooks / previous_week_active_cooks) * 100
     else:
         cook_retention_rate = 0
     
     # Monthly active cooks
-    monthly_active_cooks = CookProfile.objects.filter(
-        received_orders__created_at__gte=month_ago
-    ).distinct().count()
+    monthly_active_cooks = sum(1 for row in cook_activity if row['this_month'])
     
     # Cook activation rate (% of approved cooks who have received orders)
-    cooks_with_orders = CookProfile.objects.filter(
-        received_orders__isnull=False
-    ).distinct().count()
+    cooks_with_orders = len(cook_activity)
     cook_activation_rate = (cooks_with_orders / approved_cooks * 100) if approved_cooks > 0 else 0
     
     # METRIC 3: Proximity Match Success Rate
@@ -220,9 +241,9 @@ def admin_analytics(request):
     # vs orders that were cancelled (potentially due to distance issues)
     
     # For proximity analysis, we look at delivery orders specifically
-    delivery_total = Order.objects.filter(delivery_type='delivery').count()
-    delivery_completed = Order.objects.filter(delivery_type='delivery', status='completed').count()
-    delivery_cancelled = Order.objects.filter(delivery_type='delivery', status='cancelled').count()
+    delivery_total = order_stats['delivery_orders']
+    delivery_completed = order_stats['delivery_completed']
+    delivery_cancelled = order_stats['delivery_cancelled']
     
     # Proximity success rate for delivery orders
     if delivery_total > 0:
@@ -231,13 +252,13 @@ def admin_analytics(request):
         proximity_success_rate = 0
     
     # Pickup success rate (customers who successfully picked up)
-    pickup_total = Order.objects.filter(delivery_type='pickup').count()
-    pickup_completed = Order.objects.filter(delivery_type='pickup', status='completed').count()
+    pickup_total = order_stats['pickup_orders']
+    pickup_completed = order_stats['pickup_completed']
     pickup_success_rate = (pickup_completed / pickup_total * 100) if pickup_total > 0 else 0
     
     # Dine-in success rate
-    dinein_total = Order.objects.filter(delivery_type='dine_in').count()
-    dinein_completed = Order.objects.filter(delivery_type='dine_in', status='completed').count()
+    dinein_total = order_stats['dine_in_orders']
+    dinein_completed = order_stats['dine_in_completed']
     dinein_success_rate = (dinein_completed / dinein_total * 100) if dinein_total > 0 else 0
     
     # Overall match success (all order types)
@@ -288,11 +309,11 @@ def admin_analytics(request):
             'avg_meal_rating': round(float(avg_meal_rating), 2),
             'avg_cook_rating': round(float(avg_cook_rating), 2),
             'distribution': {
-                '5_star': ratings_5_star,
-                '4_star': ratings_4_star,
-                '3_star': ratings_3_star,
-                '2_star': ratings_2_star,
-                '1_star': ratings_1_star,
+                '5_star': rating_stats['5_star'],
+                '4_star': rating_stats['4_star'],
+                '3_star': rating_stats['3_star'],
+                '2_star': rating_stats['2_star'],
+                '1_star': rating_stats['1_star'],
             }
         },
         'top_performers': {
@@ -0,0 +1,30 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from analytics.rollups import rebuild_order_stats, rebuild_signup_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the daily analytics rollups (orders, revenue, signups) from the raw tables'
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group()
+        group.add_argument('--since', help='Only rebuild days from this date (YYYY-MM-DD)')
+        group.add_argument('--days', type=int, help='Only rebuild the last N days')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format')
+        elif options['days'] is not None:
+            since = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        order_rows = rebuild_order_stats(since)
+        signup_rows = rebuild_signup_stats(since)
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Rebuilt {order_rows} order rollup row(s) and {signup_rows} signup rollup row(s)'
+        ))
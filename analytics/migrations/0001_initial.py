@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+
+
+# Frozen copy of analytics.rollups.rebuild_* over the historical models
+def build_rollups(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Order = apps.get_model('orders', 'Order')
+    User = apps.get_model('accounts', 'User')
+    OrderDailyStats = apps.get_model('analytics', 'OrderDailyStats')
+    SignupDailyStats = apps.get_model('analytics', 'SignupDailyStats')
+
+    order_rows = (
+        Order.objects.using(using).order_by()
+        .annotate(date=TruncDate('created_at'))
+        .values('date', 'cook_id', 'delivery_type')
+        .annotate(
+            orders=models.Count('id'),
+            completed=models.Count('id', filter=models.Q(status='completed')),
+            cancelled=models.Count('id', filter=models.Q(status='cancelled')),
+            revenue=models.Sum('total_price', filter=models.Q(status='completed'), default=0),
+        )
+    )
+    OrderDailyStats.objects.using(using).bulk_create(
+        (OrderDailyStats(**row) for row in order_rows), batch_size=1000
+    )
+
+    signup_rows = (
+        User.objects.using(using).order_by()
+        .annotate(date=TruncDate('date_joined'))
+        .values('date', 'role')
+        .annotate(signups=models.Count('id'))
+    )
+    SignupDailyStats.objects.using(using).bulk_create(
+        (SignupDailyStats(**row) for row in signup_rows), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0002_remove_customerprofile_office_address_and_more'),
+        ('orders', '0007_drop_redundant_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SignupDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('role', models.CharField(choices=[('cook', 'Home Cook'), ('customer', 'Customer'), ('admin', 'Admin')], max_length=20)),
+                ('signups', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'role'), name='unique_signup_daily_stats')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OrderDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('delivery_type', models.CharField(choices=[('pickup', 'Pickup'), ('delivery', 'Delivery'), ('dine_in', 'Dine-In')], max_length=20)),
+                ('orders', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('cancelled', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, help_text='Total price of the completed orders', max_digits=12)),
+                ('cook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_order_stats', to='accounts.cookprofile')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'cook', 'delivery_type'), name='unique_order_daily_stats')],
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+from django.db import models
+from accounts.models import CookProfile, User
+from orders.models import Order
+
+
+class OrderDailyStats(models.Model):
+    """Orders per day, cook and delivery type, keyed by the day each order was placed."""
+
+    date = models.DateField()
+    cook = models.ForeignKey(
+        CookProfile, on_delete=models.CASCADE, related_name='daily_order_stats'
+    )
+    delivery_type = models.CharField(max_length=20, choices=Order.DELIVERY_TYPE_CHOICES)
+    orders = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(
+        max_digits=12, decimal_places=2, default=0,
+        help_text='Total price of the completed orders'
+    )
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'cook', 'delivery_type'], name='unique_order_daily_stats'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.cook_id} {self.delivery_type}: {self.orders} orders"
+
+
+class SignupDailyStats(models.Model):
+    """New accounts per day and role."""
+
+    date = models.DateField()
+    role = models.CharField(max_length=20, choices=User.ROLE_CHOICES)
+    signups = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'role'], name='unique_signup_daily_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.role}: {self.signups} signups"
@@ -0,0 +1,144 @@
+"""
+Daily rollups behind the admin analytics endpoint.
+
+OrderDailyStats and SignupDailyStats are kept current by the receivers in
+analytics.signals: each order or account change becomes a delta against
+its day's row, with the old values subtracted and the new ones added.
+``apply_deltas`` writes any number of deltas in three queries, so
+bulk transitions cost the same as a single order. ``rebuild_*`` recompute
+the rows from the raw tables (see the rebuild_analytics command).
+
+Days are local dates (TIME_ZONE), and orders count on the day they were placed.
+"""
+from collections import Counter, defaultdict
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from accounts.models import User
+from orders.models import Order
+from .models import OrderDailyStats, SignupDailyStats
+
+
+ORDER_FIELDS = ('created_at', 'cook_id', 'delivery_type', 'status', 'total_price')
+SIGNUP_FIELDS = ('date_joined', 'role')
+
+
+def apply_deltas(model, key_fields, deltas, using=DEFAULT_DB_ALIAS):
+    """
+    Add ``deltas`` ({key tuple: Counter of field increments}) to ``model`` rows.
+
+    Missing rows are inserted at zero first (ignoring concurrent inserts of
+    the same key), then every affected row is locked, adjusted and written
+    back with one bulk_update.
+    """
+    deltas = {key: counters for key, counters in deltas.items() if any(counters.values())}
+    if not deltas:
+        return
+    manager = model.objects.using(using)
+    with transaction.atomic(using=using):
+        manager.bulk_create(
+            [
+                model(**dict(zip(key_fields, key)))
+                for key, counters in deltas.items()
+                if any(value > 0 for value in counters.values())
+            ],
+            ignore_conflicts=True
+        )
+        rows = manager.select_for_update().filter(**{
+            f'{field}__in': {key[index] for key in deltas}
+            for index, field in enumerate(key_fields)
+        })
+        changed = []
+        fields = set()
+        for row in rows:
+            counters = deltas.get(tuple(getattr(row, field) for field in key_fields))
+            if not counters:
+                continue
+            for name, value in counters.items():
+                setattr(row, name, getattr(row, name) + value)
+                fields.add(name)
+            changed.append(row)
+        if changed:
+            manager.bulk_update(changed, sorted(fields))
+
+
+def order_deltas(added=(), removed=()):
+    """Deltas for orders given as dicts of ORDER_FIELDS."""
+    deltas = defaultdict(Counter)
+    for orders, sign in ((added, 1), (removed, -1)):
+        for order in orders:
+            counters = deltas[(
+                timezone.localdate(order['created_at']), order['cook_id'], order['delivery_type']
+            )]
+            counters['orders'] += sign
+            if order['status'] == 'completed':
+                counters['completed'] += sign
+                counters['revenue'] += sign * order['total_price']
+            elif order['status'] == 'cancelled':
+                counters['cancelled'] += sign
+    return deltas
+
+
+def record_orders(added=(), removed=(), using=DEFAULT_DB_ALIAS):
+    apply_deltas(
+        OrderDailyStats, ('date', 'cook_id', 'delivery_type'), order_deltas(added, removed), using
+    )
+
+
+def record_signups(added=(), removed=(), using=DEFAULT_DB_ALIAS):
+    """Count accounts given as dicts of SIGNUP_FIELDS."""
+    deltas = defaultdict(Counter)
+    for users, sign in ((added, 1), (removed, -1)):
+        for user in users:
+            deltas[(timezone.localdate(user['date_joined']), user['role'])]['signups'] += sign
+    apply_deltas(SignupDailyStats, ('date', 'role'), deltas, using)
+
+
+def rebuild_order_stats(since=None):
+    """Recompute OrderDailyStats from orders (placed on or after ``since``); returns the row count."""
+    orders = Order.objects.all()
+    stats = OrderDailyStats.objects.all()
+    if since is not None:
+        orders = orders.filter(created_at__date__gte=since)
+        stats = stats.filter(date__gte=since)
+    rows = (
+        orders.order_by()
+        .annotate(date=TruncDate('created_at'))
+        .values('date', 'cook_id', 'delivery_type')
+        .annotate(
+            orders=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            cancelled=Count('id', filter=Q(status='cancelled')),
+            revenue=Sum('total_price', filter=Q(status='completed'), default=0),
+        )
+    )
+    with transaction.atomic():
+        stats.delete()
+        created = OrderDailyStats.objects.bulk_create(
+            (OrderDailyStats(**row) for row in rows), batch_size=1000
+        )
+    return len(created)
+
+
+def rebuild_signup_stats(since=None):
+    """Recompute SignupDailyStats from accounts (joined on or after ``since``); returns the row count."""
+    users = User.objects.all()
+    stats = SignupDailyStats.objects.all()
+    if since is not None:
+        users = users.filter(date_joined__date__gte=since)
+        stats = stats.filter(date__gte=since)
+    rows = (
+        users.order_by()
+        .annotate(date=TruncDate('date_joined'))
+        .values('date', 'role')
+        .annotate(signups=Count('id'))
+    )
+    with transaction.atomic():
+        stats.delete()
+        created = SignupDailyStats.objects.bulk_create(
+            (SignupDailyStats(**row) for row in rows), batch_size=1000
+        )
+    return len(created)
@@ -0,0 +1,86 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from orders.events import orders_created, orders_status_changed
+from orders.models import Order
+from . import rollups
+
+
+ORDER_STATS_FIELDS = {'created_at', 'cook', 'delivery_type', 'status', 'total_price'}
+SIGNUP_STATS_FIELDS = {'date_joined', 'role'}
+
+
+def _order_values(order):
+    return {field: getattr(order, field) for field in rollups.ORDER_FIELDS}
+
+
+def _user_values(user):
+    return {field: getattr(user, field) for field in rollups.SIGNUP_FIELDS}
+
+
+@receiver(pre_save, sender=Order)
+def remember_order_stats(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    """Keep the stored values an update is about to replace."""
+    instance._stats_previous = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not ORDER_STATS_FIELDS.intersection(update_fields):
+        return
+    instance._stats_previous = Order.objects.using(using).filter(pk=instance.pk).values(
+        *rollups.ORDER_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=Order)
+def count_saved_order(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    current = _order_values(instance)
+    if created or (previous and previous != current):
+        rollups.record_orders(added=[current], removed=[previous] if previous else [], using=using)
+
+
+@receiver(post_delete, sender=Order)
+def uncount_deleted_order(sender, instance, using=None, **kwargs):
+    rollups.record_orders(removed=[_order_values(instance)], using=using)
+
+
+@receiver(orders_created)
+def count_created_orders(sender, orders, **kwargs):
+    rollups.record_orders(added=[_order_values(order) for order in orders])
+
+
+@receiver(orders_status_changed)
+def count_status_changes(sender, orders, new_status, using=None, **kwargs):
+    rollups.record_orders(
+        added=[{**order, 'status': new_status} for order in orders], removed=orders, using=using
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_signup_stats(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    instance._stats_previous = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not SIGNUP_STATS_FIELDS.intersection(update_fields):
+        return
+    instance._stats_previous = User.objects.using(using).filter(pk=instance.pk).values(
+        *rollups.SIGNUP_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def count_signup(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_stats_previous', None)
+    current = _user_values(instance)
+    if created or (previous and previous != current):
+        rollups.record_signups(added=[current], removed=[previous] if previous else [], using=using)
+
+
+@receiver(post_delete, sender=User)
+def uncount_deleted_user(sender, instance, using=None, **kwargs):
+    rollups.record_signups(removed=[_user_values(instance)], using=using)
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from homebite.testing import create_cook, create_customer, create_meal
+from orders.models import Order
+from ratings.models import Rating
+from .models import OrderDailyStats, SignupDailyStats
+from .rollups import rebuild_order_stats, rebuild_signup_stats
+
+
+class AdminAnalyticsQueryTests(TestCase):
+    """admin_analytics reads each table once, whatever the data size."""
+
+    # One aggregate each for users, signups, meals, open orders, order
+    # rollups, cook activity and ratings, plus the three top-five lists
+    MAX_QUERIES = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            'admin', 'admin@example.com', None, role='admin', is_staff=True
+        )
+        cls.batches = 0
+
+    def _add_data(self, cooks=2, orders_per_cook=3):
+        """Add cooks with one meal each, and orders in every status for a new customer."""
+        self.batches += 1
+        customer = create_customer(f'customer{self.batches}')
+        for index in range(cooks):
+            cook = create_cook(f'cook{self.batches}_{index}')
+            meal = create_meal(cook, f'Karahi {index}', price=400, quantity_available=20)
+            for status, _ in Order.STATUS_CHOICES:
+                for _ in range(orders_per_cook):
+                    order = Order.objects.create(
+                        customer=customer, meal=meal, cook=cook, quantity=1, total_price=400,
+                        status=status, customer_phone='03001234567'
+                    )
+                    if status == 'completed':
+                        completed_order = order
+            Rating.objects.create(
+                customer=customer, order=completed_order, meal=meal, cook=cook, meal_rating=5, cook_rating=4
+            )
+
+    def _get_analytics(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/analytics/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.data, len(queries.captured_queries)
+
+    def test_query_count_is_bounded(self):
+        self._add_data()
+        data, small_queries = self._get_analytics()
+        self.assertLessEqual(small_queries, self.MAX_QUERIES)
+
+        self._add_data(cooks=6, orders_per_cook=5)
+        data, large_queries = self._get_analytics()
+        self.assertEqual(large_queries, small_queries)
+
+        statuses = len(Order.STATUS_CHOICES)
+        self.assertEqual(data['orders']['total'], (2 * 3 + 6 * 5) * statuses)
+        self.assertEqual(data['orders']['completed'], 2 * 3 + 6 * 5)
+        self.assertEqual(data['orders']['pending'], 2 * 3 + 6 * 5)
+        self.assertEqual(data['revenue']['total'], float(Decimal(400) * (2 * 3 + 6 * 5)))
+        self.assertEqual(data['users']['cooks'], 8)
+        self.assertEqual(data['users']['signups_last_7_days'], 11)
+        self.assertEqual(data['ratings']['distribution']['5_star'], 8)
+        self.assertEqual(data['key_metrics']['cook_retention']['weekly_active_cooks'], 8)
+
+
+class RollupConsistencyTests(TestCase):
+    """The incrementally maintained rollups must match a rebuild from the raw tables."""
+
+    def _snapshot(self):
+        return (
+            sorted(OrderDailyStats.objects.filter(orders__gt=0).values_list(
+                'date', 'cook_id', 'delivery_type', 'orders', 'completed', 'cancelled', 'revenue'
+            )),
+            sorted(SignupDailyStats.objects.filter(signups__gt=0).values_list('date', 'role', 'signups')),
+        )
+
+    def test_incremental_rollups_match_a_rebuild(self):
+        cooks = [create_cook(f'cook{index}') for index in range(2)]
+        meals = [create_meal(cook, quantity_available=50) for cook in cooks]
+        customer = create_customer()
+
+        def order(meal, **fields):
+            return Order.objects.create(
+                customer=customer, meal=meal, cook=meal.cook, quantity=1, total_price=250,
+                customer_phone='03001234567', **fields
+            )
+
+        orders = [order(meal) for meal in meals for _ in range(3)]
+        order(meals[0], delivery_type='delivery', status='completed')
+        # Single saves, bulk transitions, moves between days and deletions
+        orders[0].status = 'completed'
+        orders[0].save()
+        Order.objects.filter(pk__in=[orders[1].pk, orders[3].pk]).complete()
+        Order.objects.filter(pk=orders[4].pk).cancel()
+        orders[5].created_at = timezone.now() - timedelta(days=3)
+        orders[5].save()
+        orders[2].delete()
+        # Signups that change role or leave
+        switcher = create_customer('switcher').user
+        switcher.role = 'cook'
+        switcher.save()
+        create_customer('leaver').user.delete()
+
+        incremental = self._snapshot()
+        rebuild_order_stats()
+        rebuild_signup_stats()
+        self.assertEqual(incremental, self._snapshot())
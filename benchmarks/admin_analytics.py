@@ -0,0 +1,212 @@
+"""
+Benchmark: admin_analytics against the per-count queries it replaced.
+
+Seeds a throwaway SQLite database with synthetic users, meals, orders and
+ratings, builds the analytics rollups, then times both versions and counts
+their queries.
+
+Usage:
+    python benchmarks/admin_analytics.py [--orders 200000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+from datetime import time, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORKDIR = tempfile.mkdtemp(prefix='homebite-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'bench.sqlite3')}"
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'homebite.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import Avg, Count, Q, Sum  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.utils import timezone  # noqa: E402
+from rest_framework.test import APIRequestFactory, force_authenticate  # noqa: E402
+
+from accounts.models import CookProfile, CustomerProfile, User  # noqa: E402
+from analytics.api_views import admin_analytics  # noqa: E402
+from analytics.rollups import rebuild_order_stats, rebuild_signup_stats  # noqa: E402
+from meals.models import Meal  # noqa: E402
+from orders.models import Order  # noqa: E402
+from ratings.models import Rating  # noqa: E402
+
+STATUSES = ['pending', 'confirmed', 'ready', 'completed', 'completed', 'completed', 'cancelled']
+DELIVERY_TYPES = ['pickup', 'delivery', 'dine_in']
+
+
+def seed(order_count, seed=42):
+    """Bulk-insert a synthetic marketplace with ``order_count`` orders spread over a year."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    cook_count = max(10, order_count // 200)
+    customer_count = max(10, order_count // 20)
+
+    users = User.objects.bulk_create(
+        [User(username=f'cook{i}', role='cook', is_approved=rng.random() < 0.9, password='!')
+         for i in range(cook_count)] +
+        [User(username=f'customer{i}', role='customer', password='!') for i in range(customer_count)],
+        batch_size=2000
+    )
+    cooks = CookProfile.objects.bulk_create(
+        [CookProfile(user=user) for user in users[:cook_count]], batch_size=2000
+    )
+    customers = CustomerProfile.objects.bulk_create(
+        [CustomerProfile(user=user) for user in users[cook_count:]], batch_size=2000
+    )
+    meals = Meal.objects.bulk_create(
+        [Meal(cook=cooks[i % cook_count], name=f'Meal {i}', price=rng.randint(150, 900),
+              quantity_available=rng.randint(0, 30), ready_time=time(12),
+              is_active=rng.random() < 0.8, is_approved=True,
+              dine_with_us_available=rng.random() < 0.3)
+         for i in range(cook_count * 3)],
+        batch_size=2000
+    )
+
+    orders = []
+    for _ in range(order_count):
+        meal = rng.choice(meals)
+        quantity = rng.randint(1, 4)
+        orders.append(Order(
+            customer=rng.choice(customers), meal=meal, cook_id=meal.cook_id, quantity=quantity,
+            total_price=meal.price * quantity, status=rng.choice(STATUSES),
+            delivery_type=rng.choice(DELIVERY_TYPES), customer_phone='03001234567'
+        ))
+    orders = Order.objects.bulk_create(orders, batch_size=2000)
+
+    # auto_now_add stamps everything "now"; spread orders and signups over a year
+    day_offsets = [timedelta(days=rng.randint(0, 364), minutes=rng.randint(0, 1439)) for _ in orders]
+    for order, offset in zip(orders, day_offsets):
+        order.created_at = now - offset
+    Order.objects.bulk_update(orders, ['created_at'], batch_size=2000)
+    for user in users:
+        user.date_joined = now - timedelta(days=rng.randint(0, 364))
+    User.objects.bulk_update(users, ['date_joined'], batch_size=2000)
+
+    Rating.objects.bulk_create(
+        [Rating(customer_id=order.customer_id, order=order, meal_id=order.meal_id, cook_id=order.cook_id,
+                meal_rating=rng.randint(1, 5), cook_rating=rng.randint(1, 5))
+         for order in orders if order.status == 'completed' and rng.random() < 0.3],
+        batch_size=2000
+    )
+    rebuild_order_stats()
+    rebuild_signup_stats()
+    return User.objects.create_user('bench-admin', None, None, role='admin', is_staff=True)
+
+
+def per_count_analytics():
+    """The queries admin_analytics issued before it used aggregates and rollups."""
+    now = timezone.now()
+    week_ago, two_weeks_ago, month_ago = (now - timedelta(days=days) for days in (7, 14, 30))
+    results = [
+        User.objects.count(),
+        User.objects.filter(role='cook').count(),
+        User.objects.filter(role='customer').count(),
+        User.objects.filter(role='cook', is_approved=True).count(),
+        User.objects.filter(role='cook', is_approved=False).count(),
+        User.objects.filter(date_joined__gte=week_ago).count(),
+        User.objects.filter(date_joined__gte=month_ago).count(),
+        Meal.objects.count(),
+        Meal.objects.filter(is_active=True).count(),
+        Meal.objects.filter(is_active=False).count(),
+        Meal.objects.filter(dine_with_us_available=True).count(),
+        Meal.objects.filter(created_at__gte=week_ago).count(),
+        Meal.objects.filter(created_at__gte=month_ago).count(),
+        Order.objects.count(),
+        Order.objects.filter(created_at__gte=week_ago).count(),
+        Order.objects.filter(created_at__gte=month_ago).count(),
+        Order.objects.filter(created_at__date=now.date()).count(),
+        Order.objects.filter(created_at__gte=two_weeks_ago, created_at__lt=week_ago).count(),
+        Order.objects.filter(status='completed').count(),
+        Rating.objects.count(),
+        Rating.objects.aggregate(avg=Avg('meal_rating')),
+        Rating.objects.aggregate(avg=Avg('cook_rating')),
+    ]
+    results += [Order.objects.filter(status=status).count() for status in sorted(set(STATUSES))]
+    for delivery_type in DELIVERY_TYPES:
+        # Counted once for the order breakdown and again for the success rates
+        results += [
+            Order.objects.filter(delivery_type=delivery_type).count(),
+            Order.objects.filter(delivery_type=delivery_type).count(),
+            Order.objects.filter(delivery_type=delivery_type, status='completed').count(),
+        ]
+    completed = Order.objects.filter(status='completed')
+    results += [
+        completed.aggregate(total=Sum('total_price')),
+        completed.filter(created_at__gte=week_ago).aggregate(total=Sum('total_price')),
+        completed.filter(created_at__gte=month_ago).aggregate(total=Sum('total_price')),
+    ]
+    results += [
+        Rating.objects.filter(Q(meal_rating=stars) | Q(cook_rating=stars)).count() for stars in range(1, 6)
+    ]
+    results += [
+        CookProfile.objects.filter(received_orders__created_at__gte=since).distinct().count()
+        for since in (week_ago, month_ago)
+    ]
+    previous = CookProfile.objects.filter(
+        received_orders__created_at__gte=two_weeks_ago, received_orders__created_at__lt=week_ago
+    )
+    results += [
+        previous.distinct().count(),
+        set(previous.values_list('id', flat=True).distinct()),
+        set(CookProfile.objects.filter(received_orders__created_at__gte=week_ago)
+            .values_list('id', flat=True).distinct()),
+        CookProfile.objects.filter(received_orders__isnull=False).distinct().count(),
+        Order.objects.filter(delivery_type='delivery', status='cancelled').count(),
+        [(cook.username, getattr(cook, 'cook_profile', None))
+         for cook in User.objects.filter(role='cook').order_by('-cook_profile__rating')[:5]],
+        [(meal.name, meal.cook.user.username)
+         for meal in Meal.objects.annotate(order_count=Count('orders')).order_by('-order_count')[:5]],
+        list(User.objects.filter(role='customer').annotate(
+            order_count=Count('customer_profile__orders')
+        ).order_by('-order_count')[:5]),
+    ]
+    return results
+
+
+def aggregated_analytics(admin):
+    request = APIRequestFactory().get('/api/analytics/stats/', SERVER_NAME='localhost')
+    force_authenticate(request, admin)
+    return admin_analytics(request)
+
+
+def measure(func, *args, repeat=5):
+    with CaptureQueriesContext(connection) as queries:
+        func(*args)
+    timer = timeit.Timer(lambda: func(*args))
+    return min(timer.repeat(repeat=repeat, number=1)), len(queries.captured_queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=200_000)
+    args = parser.parse_args()
+
+    try:
+        call_command('migrate', verbosity=0)
+        print(f'Seeding {args.orders} orders ...')
+        admin = seed(args.orders)
+
+        per_count_time, per_count_queries = measure(per_count_analytics)
+        aggregated_time, aggregated_queries = measure(aggregated_analytics, admin)
+    finally:
+        connection.close()
+        shutil.rmtree(WORKDIR, ignore_errors=True)
+    print(f"{'version':>12} {'queries':>8} {'ms':>10}")
+    print(f"{'per-count':>12} {per_count_queries:>8} {per_count_time * 1000:>10.1f}")
+    print(f"{'aggregated':>12} {aggregated_queries:>8} {aggregated_time * 1000:>10.1f}")
+    print(f'speedup: {per_count_time / aggregated_time:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: scalar haversine loop vs. the vectorized batch in homebite.geo.
+
+Usage:
+    python benchmarks/haversine.py
+"""
+import os
+import random
+import sys
+import timeit
+from decimal import Decimal
+from math import asin, cos, radians, sin, sqrt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from homebite.geo import haversine_km  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+CUSTOMER = (Decimal('31.520400'), Decimal('74.358700'))  # Lahore
+
+
+def scalar_haversine(lon1, lat1, lon2, lat2):
+    """The per-meal implementation previously in homebite.utils."""
+    lon1, lat1, lon2, lat2 = map(float, [lon1, lat1, lon2, lat2])
+    lon1, lat1, lon2, lat2 = map(radians, [lon1, lat1, lon2, lat2])
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
+    return round(6371 * 2 * asin(sqrt(a)), 2)
+
+
+def make_kitchens(count, seed=42):
+    """Random Decimal kitchen coordinates within ~10 km of the customer."""
+    rng = random.Random(seed)
+    lats = [CUSTOMER[0] + Decimal(rng.randint(-90000, 90000)) / 1000000 for _ in range(count)]
+    lngs = [CUSTOMER[1] + Decimal(rng.randint(-90000, 90000)) / 1000000 for _ in range(count)]
+    return lats, lngs
+
+
+def run_scalar(lats, lngs):
+    return [scalar_haversine(CUSTOMER[1], CUSTOMER[0], lng, lat) for lat, lng in zip(lats, lngs)]
+
+
+def run_batch(lats, lngs):
+    return haversine_km(CUSTOMER[0], CUSTOMER[1], lats, lngs)
+
+
+def best_of(func, *args, repeat=5):
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main():
+    print(f"{'cooks':>8} {'scalar ms':>12} {'batch ms':>12} {'speedup':>9}")
+    for size in SIZES:
+        lats, lngs = make_kitchens(size)
+        scalar = best_of(run_scalar, lats, lngs)
+        batch = best_of(run_batch, lats, lngs)
+        print(f"{size:>8} {scalar * 1000:>12.2f} {batch * 1000:>12.2f} {scalar / batch:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -5,6 +5,7 @@ urlpatterns = [
     # Cook dashboard
     path('cook/stats/', api_views.cook_dashboard_stats, name='cook_dashboard_stats'),
     path('cook/todays-orders/', api_views.cook_todays_orders, name='cook_todays_orders'),
+    path('cook/orders/stream/', api_views.cook_orders_stream, name='cook_orders_stream'),
     
     # Customer dashboard
     path('customer/stats/', api_views.customer_dashboard_stats, name='customer_dashboard_stats'),
@@ -1,15 +1,29 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
-from django.db.models import Sum, Count, Q, Avg
+from django.db.models import Sum, Count, F, Q, Avg, Window
+from django.db.models.functions import RowNumber
+from rest_framework.utils.urls import replace_query_param
+from accounts.models import CookProfile
+from homebite.events import broker
+from homebite.pagination import KeysetPagination
+from orders.events import cook_channel
 from orders.models import Order
-from orders.serializers import OrderSerializer
+from orders.serializers import OrderListSerializer
 from meals.models import Meal
 from decimal import Decimal
 
 
+COOK_ACTIVE_STATUSES = ('pending', 'confirmed', 'ready')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def cook_dashboard_stats(request):
@@ -72,7 +86,13 @@ def cook_dashboard_stats(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def cook_todays_orders(request):
-    """Get today's orders for cook, grouped by status."""
+    """
+    Get the cook's active orders grouped by status, plus recent completed ones.
+    
+    ``completed`` holds one page (``page_size``) of the newest completed
+    orders; ``completed_next`` links to the next page. ``counts`` has the
+    total per status. Costs two queries however long the cook's history is.
+    """
     if request.user.role != 'cook':
         return Response(
             {'error': 'Only cooks can access orders. Your account role is: ' + request.user.role},
@@ -87,33 +107,59 @@ def cook_todays_orders(request):
     
     cook_profile = request.user.cook_profile
     
-    # Get orders by status (all pending/confirmed/ready orders, not just today)
-    pending_orders = Order.objects.filter(
-        cook=cook_profile,
-        status='pending'
-    ).select_related('customer__user', 'meal').order_by('-created_at')
-    
-    confirmed_orders = Order.objects.filter(
-        cook=cook_profile,
-        status='confirmed'
-    ).select_related('customer__user', 'meal').order_by('-created_at')
-    
-    ready_orders = Order.objects.filter(
-        cook=cook_profile,
-        status='ready'
-    ).select_related('customer__user', 'meal').order_by('-created_at')
+    # Every active order, plus one page of the most recent completed ones
+    page_size = KeysetPagination().get_page_size(request)
+    try:
+        offset = max(0, int(request.query_params.get('completed_offset', 0)))
+    except ValueError:
+        offset = 0
     
-    completed_orders = Order.objects.filter(
+    # One query: the window functions rank completed orders and count every
+    # status before the completed rows outside this page are filtered out
+    orders = Order.objects.filter(
         cook=cook_profile,
-        status='completed'
-    ).select_related('customer__user', 'meal').order_by('-created_at')
+        status__in=COOK_ACTIVE_STATUSES + ('completed',)
+    ).annotate(
+        status_position=Window(
+            RowNumber(), partition_by=F('status'), order_by=[F('created_at').desc(), F('id').desc()]
+        ),
+        **{
+            f'{name}_count': Window(Count('id', filter=Q(status=name)))
+            for name in COOK_ACTIVE_STATUSES + ('completed',)
+        }
+    ).filter(
+        Q(status__in=COOK_ACTIVE_STATUSES) |
+        Q(status_position__gt=offset, status_position__lte=offset + page_size)
+    ).select_related('meal', 'cook__user', 'customer__user').order_by('-created_at', '-id')
+    
+    orders = list(orders)
+    grouped = {name: [] for name in COOK_ACTIVE_STATUSES + ('completed',)}
+    for order in orders:
+        grouped[order.status].append(order)
+    if orders:
+        # Every row carries the same totals
+        counts = {name: getattr(orders[0], f'{name}_count') for name in grouped}
+    elif offset:
+        # A page past the last completed order has no rows to carry the totals
+        counts = Order.objects.filter(cook=cook_profile).aggregate(**{
+            name: Count('id', filter=Q(status=name)) for name in grouped
+        })
+    else:
+        counts = {name: 0 for name in grouped}
+    
+    completed_next = None
+    if offset + page_size < counts['completed']:
+        completed_next = replace_query_param(
+            request.build_absolute_uri(), 'completed_offset', offset + page_size
+        )
     
-    return Response({
-        'pending': OrderSerializer(pending_orders, many=True).data,
-        'confirmed': OrderSerializer(confirmed_orders, many=True).data,
-        'ready': OrderSerializer(ready_orders, many=True).data,
-        'completed': OrderSerializer(completed_orders, many=True).data,
-    })
+    response = {
+        name: OrderListSerializer(grouped[name], many=True, context={'request': request}).data
+        for name in grouped
+    }
+    response['counts'] = counts
+    response['completed_next'] = completed_next
+    return Response(response)
 
 
 @api_view(['GET'])
@@ -158,3 +204,48 @@ def customer_dashboard_stats(request):
         'orders_to_rate': rateable_count,
         'total_spent': float(total_spent),
     })
+
+
+async def cook_orders_stream(request):
+    """
+    Server-sent events for the cook's orders (order.created, order.status_changed).
+    
+    Clients load /api/dashboard/cook/todays-orders/ once, then apply events
+    from this stream; a ``resync`` event means events were dropped and the
+    client should load the orders again. Needs an ASGI server (see
+    homebite/asgi.py).
+    """
+    user = await request.auser()
+    if not user.is_authenticated:
+        return JsonResponse(
+            {'detail': 'Authentication credentials were not provided.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    if user.role != 'cook':
+        return JsonResponse(
+            {'error': 'Only cooks can access orders. Your account role is: ' + user.role},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    cook_id = await CookProfile.objects.filter(user=user).values_list('pk', flat=True).afirst()
+    if cook_id is None:
+        return JsonResponse(
+            {'error': 'Cook profile not found. Please contact support.'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    async def events():
+        async with broker.subscribe(cook_channel(cook_id)) as subscription:
+            yield 'retry: 5000\n\n'
+            while True:
+                event = await subscription.get(timeout=settings.SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keepalive\n\n'
+                    continue
+                data = json.dumps(event.data, cls=DjangoJSONEncoder)
+                yield f'id: {event.id}\nevent: {event.name}\ndata: {data}\n\n'
+    
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
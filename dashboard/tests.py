@@ -1,3 +1,97 @@
-from django.test import TestCase
+import asyncio
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from homebite.testing import create_cook, create_customer, create_meal
+from orders.models import Order
+
+
+EXPLAIN_PREFIX = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+
+
+@skipUnless(connection.vendor in EXPLAIN_PREFIX, 'EXPLAIN output is backend specific')
+class DashboardQueryPlanTests(TestCase):
+    """The dashboard's order queries must be served by the (cook|customer, status) indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cook = create_cook()
+        cls.cook_user = cook.user
+        meal = create_meal(cook, 'Nihari', price=300, quantity_available=50)
+        customer = create_customer()
+        cls.customer_user = customer.user
+        Order.objects.bulk_create(
+            Order(
+                customer=customer, meal=meal, cook=cook, quantity=1, total_price=300,
+                status=status, customer_phone='03001234567'
+            )
+            for status, _ in Order.STATUS_CHOICES
+            for _ in range(3)
+        )
+
+    def _order_query_plans(self, user, url):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables would otherwise always be scanned
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            for query in queries.captured_queries:
+                if 'FROM "orders_order"' not in query['sql']:
+                    continue
+                cursor.execute(EXPLAIN_PREFIX[connection.vendor] + query['sql'])
+                plans.append(' '.join(str(column) for row in cursor.fetchall() for column in row))
+        self.assertTrue(plans)
+        return plans
+
+    def test_cook_todays_orders_use_cook_status_index(self):
+        plans = self._order_query_plans(self.cook_user, '/api/dashboard/cook/todays-orders/')
+        for plan in plans:
+            self.assertIn('order_cook_status_idx', plan)
+
+    def test_customer_stats_use_customer_status_index(self):
+        plans = self._order_query_plans(self.customer_user, '/api/dashboard/customer/stats/')
+        for plan in plans:
+            self.assertIn('order_customer_status_idx', plan)
+
+
+@override_settings(SSE_KEEPALIVE_SECONDS=0.05)
+class CookOrdersStreamTests(TestCase):
+    """The order stream answers at once and keeps idle connections alive."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cook_user = create_cook().user
+
+    async def test_stream_sends_headers_and_keepalive(self):
+        await self.async_client.aforce_login(self.cook_user)
+        response = await asyncio.wait_for(
+            self.async_client.get('/api/dashboard/cook/orders/stream/'), timeout=5
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+        chunks = aiter(response.streaming_content)
+        try:
+            first = await asyncio.wait_for(anext(chunks), timeout=5)
+            second = await asyncio.wait_for(anext(chunks), timeout=5)
+        finally:
+            await chunks.aclose()
+            # streaming_content only wraps the view's generator; close that
+            # too so it leaves the broker channel before the loop goes away
+            await response._iterator.aclose()
+        self.assertEqual(first, b'retry: 5000\n\n')
+        self.assertEqual(second, b': keepalive\n\n')
@@ -0,0 +1,45 @@
+import PropTypes from 'prop-types';
+
+/**
+ * LoadMoreButton Component - Fetches the next page of a paginated list
+ *
+ * @param {string} next - URL of the next page; nothing is rendered without one
+ * @param {function} onLoadMore - Callback that loads the next page
+ * @param {boolean} loading - If true, the button is disabled while the page loads
+ */
+const LoadMoreButton = ({ next, onLoadMore, loading = false }) => {
+  if (!next) {
+    return null;
+  }
+
+  return (
+    <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+      <button
+        onClick={onLoadMore}
+        disabled={loading}
+        style={{
+          background: 'white',
+          color: '#FF6B35',
+          border: '2px solid #FF6B35',
+          padding: '0.75rem 1.75rem',
+          borderRadius: '0.5rem',
+          fontWeight: '600',
+          cursor: loading ? 'wait' : 'pointer',
+          opacity: loading ? 0.6 : 1,
+          transition: 'all 0.3s ease'
+        }}
+      >
+        <i className={`bi ${loading ? 'bi-hourglass-split' : 'bi-arrow-down-circle'} me-2`}></i>
+        {loading ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+};
+
+LoadMoreButton.propTypes = {
+  next: PropTypes.string,
+  onLoadMore: PropTypes.func.isRequired,
+  loading: PropTypes.bool,
+};
+
+export default LoadMoreButton;
@@ -114,7 +114,7 @@ const RatingModal = ({ order, onSubmit, onClose }) => {
               color: '#212529',
               marginBottom: '0.5rem'
             }}>
-              {order.meal_details?.name}
+              {order.meal_name}
             </h6>
             <p style={{ color: '#757575', fontSize: '0.9rem', marginBottom: '1rem', fontWeight: '300' }}>
               How was the meal?
@@ -130,7 +130,7 @@ const RatingModal = ({ order, onSubmit, onClose }) => {
               color: '#212529',
               marginBottom: '0.5rem'
             }}>
-              Cook: {order.meal_details?.cook_name}
+              Cook: {order.cook_name}
             </h6>
             <p style={{ color: '#757575', fontSize: '0.9rem', marginBottom: '1rem', fontWeight: '300' }}>
               How was your experience with the cook?
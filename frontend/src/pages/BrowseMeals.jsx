@@ -2,12 +2,15 @@ import { useState, useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { mealService } from '../services/mealService';
 import { useAuth } from '../context/AuthContext';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const BrowseMeals = () => {
   const { user, loading: authLoading } = useAuth();
   const navigate = useNavigate();
   const [meals, setMeals] = useState([]);
+  const [next, setNext] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [showNearby, setShowNearby] = useState(false);
   const [maxDistance, setMaxDistance] = useState(2);
@@ -55,27 +58,34 @@ const BrowseMeals = () => {
     fetchMeals();
   }, [showNearby, maxDistance, sortBy]);
 
+  const sortByPrice = (list) => list.sort((a, b) => parseFloat(a.price) - parseFloat(b.price));
+
   const fetchMeals = async () => {
     setLoading(true);
     try {
       let data;
+      let nextPage = null;
       if (showNearby) {
         data = await mealService.getNearbyMeals(maxDistance);
         // Sort meals by distance if available
         if (sortBy === 'distance') {
           data = data.sort((a, b) => (a.distance_km || 999) - (b.distance_km || 999));
         } else if (sortBy === 'price') {
-          data = data.sort((a, b) => parseFloat(a.price) - parseFloat(b.price));
+          data = sortByPrice(data);
         }
       } else {
         // Use browseMeals service which calls /meals/browse/ endpoint
-        data = await mealService.browseMeals();
-        // Sort all meals by price or availability
+        // The first page renders straight away; later pages load on demand
+        const page = await mealService.browseMeals();
+        data = page.results;
+        nextPage = page.next;
+        // Sort loaded meals by price or availability
         if (sortBy === 'price') {
-          data = data.sort((a, b) => parseFloat(a.price) - parseFloat(b.price));
+          data = sortByPrice(data);
         }
       }
       setMeals(data);
+      setNext(nextPage);
       setError('');
     } catch (err) {
       console.error('Error fetching meals:', err);
@@ -90,6 +100,23 @@ const BrowseMeals = () => {
     }
   };
 
+  const loadMoreMeals = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await mealService.browseMeals({}, next);
+      setMeals((loaded) => {
+        const combined = [...loaded, ...page.results];
+        return sortBy === 'price' ? sortByPrice(combined) : combined;
+      });
+      setNext(page.next);
+    } catch (err) {
+      console.error('Error fetching meals:', err);
+      setError('Failed to load more meals');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   if (loading) {
     return (
       <div className="loading-container">
@@ -537,6 +564,8 @@ const BrowseMeals = () => {
             ))
           )}
         </div>
+
+        <LoadMoreButton next={next} onLoadMore={loadMoreMeals} loading={loadingMore} />
       </div>
     </div>
   );
@@ -14,12 +14,28 @@ const CookDashboard = () => {
   useEffect(() => {
     fetchData();
     
-    // Setup polling to refresh data every 20 seconds
-    const interval = setInterval(() => {
-      fetchData();
-    }, 20000);
+    // Refresh when the order stream reports a change; fall back to polling
+    // every 20 seconds if the browser or server cannot stream
+    let interval = null;
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(() => {
+          fetchData();
+        }, 20000);
+      }
+    };
     
-    return () => clearInterval(interval);
+    let unsubscribe = () => {};
+    if (typeof EventSource !== 'undefined') {
+      unsubscribe = dashboardService.subscribeCookOrders(() => fetchData(), startPolling);
+    } else {
+      startPolling();
+    }
+    
+    return () => {
+      unsubscribe();
+      if (interval) clearInterval(interval);
+    };
   }, []);
 
   const fetchData = async () => {
@@ -29,8 +45,9 @@ const CookDashboard = () => {
         mealService.getMyMeals(),
         dashboardService.getCookStats()
       ]);
-      setOrders(ordersData);
-      setMeals(mealsData);
+      // The dashboard only previews the newest orders and meals
+      setOrders(ordersData.results);
+      setMeals(mealsData.results);
       setStats(statsData);
       setLoading(false);
     } catch (err) {
@@ -70,7 +87,7 @@ const CookDashboard = () => {
     });
   };
 
-  // Get statistics from API or calculate from orders
+  // Get statistics from the API (orders only holds the newest page)
   const todayOrdersCount = stats?.today?.total_orders || 0;
   const todayEarnings = stats?.today?.total_earnings || 0;
   const pendingCount = stats?.today?.pending_count || 0;
@@ -78,9 +95,6 @@ const CookDashboard = () => {
   const cookRating = stats?.all_time?.rating || 0;
   const totalRatings = stats?.all_time?.total_ratings || 0;
   
-  const pendingOrders = orders.filter(order => order.status === 'pending');
-  const completedOrders = orders.filter(order => order.status === 'completed');
-  const totalRevenue = completedOrders.reduce((sum, order) => sum + parseFloat(order.total_price), 0);
 
   if (loading) {
     return (
@@ -185,7 +199,7 @@ const CookDashboard = () => {
             <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
               <div>
                 <p style={{ color: '#BDBDBD', fontSize: '0.85rem', fontWeight: '600', textTransform: 'uppercase', margin: 0, marginBottom: '0.5rem' }}>Pending Orders</p>
-                <h2 style={{ fontSize: '2.5rem', fontWeight: '900', color: '#212529', margin: 0 }}>{pendingOrders.length}</h2>
+                <h2 style={{ fontSize: '2.5rem', fontWeight: '900', color: '#212529', margin: 0 }}>{pendingCount}</h2>
               </div>
               <i className="bi bi-hourglass-split" style={{ fontSize: '2.5rem', color: 'rgba(255,193,7,0.2)' }}></i>
             </div>
@@ -202,7 +216,7 @@ const CookDashboard = () => {
             <div style={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center' }}>
               <div>
                 <p style={{ color: '#BDBDBD', fontSize: '0.85rem', fontWeight: '600', textTransform: 'uppercase', margin: 0, marginBottom: '0.5rem' }}>Completed</p>
-                <h2 style={{ fontSize: '2.5rem', fontWeight: '900', color: '#212529', margin: 0 }}>{completedOrders.length}</h2>
+                <h2 style={{ fontSize: '2.5rem', fontWeight: '900', color: '#212529', margin: 0 }}>{completedCount}</h2>
               </div>
               <i className="bi bi-check-circle" style={{ fontSize: '2.5rem', color: 'rgba(39,174,96,0.2)' }}></i>
             </div>
@@ -292,7 +306,7 @@ const CookDashboard = () => {
                       onMouseOut={(e) => e.currentTarget.style.background = 'white'}>
                       <td style={{ padding: '1rem', color: '#212529' }}>#{order.id}</td>
                       <td style={{ padding: '1rem', color: '#757575' }}>{order.customer_name}</td>
-                      <td style={{ padding: '1rem', color: '#757575' }}>{order.meal_details?.name}</td>
+                      <td style={{ padding: '1rem', color: '#757575' }}>{order.meal_name}</td>
                       <td style={{ padding: '1rem', textAlign: 'center', color: '#757575' }}>{order.quantity}</td>
                       <td style={{ padding: '1rem', textAlign: 'right', color: '#FF6B35', fontWeight: '700' }}>Rs. {order.total_price}</td>
                       <td style={{ padding: '1rem', textAlign: 'center' }}>
@@ -33,8 +33,8 @@ const CustomerDashboard = () => {
         orderService.getCompletedOrders(),
       ]);
       setStats(statsData);
-      setActiveOrders(activeData);
-      setCompletedOrders(completedData);
+      setActiveOrders(activeData.results);
+      setCompletedOrders(completedData.results);
       setError('');
     } catch (err) {
       setError('Failed to load dashboard data');
@@ -312,11 +312,11 @@ const CustomerDashboard = () => {
                           color: '#212529',
                           marginBottom: '0.25rem'
                         }}>
-                          {order.meal_details?.name}
+                          {order.meal_name}
                         </h6>
                         <p style={{ color: '#757575', fontSize: '0.85rem', marginBottom: '0.25rem', fontWeight: '300' }}>
                           <i className="bi bi-person-fill me-1" style={{ color: '#FF6B35' }}></i>
-                          {order.meal_details?.cook_name}
+                          {order.cook_name}
                         </p>
                         <p style={{ color: '#BDBDBD', fontSize: '0.8rem', margin: 0 }}>
                           <i className="bi bi-clock me-1"></i>
@@ -497,11 +497,11 @@ const CustomerDashboard = () => {
                       color: '#212529',
                       marginBottom: '0.5rem'
                     }}>
-                      {order.meal_details?.name}
+                      {order.meal_name}
                     </h6>
                     <p style={{ color: '#757575', fontSize: '0.9rem', marginBottom: '0.75rem', fontWeight: '300' }}>
                       <i className="bi bi-person-fill me-1" style={{ color: '#27AE60' }}></i>
-                      {order.meal_details?.cook_name}
+                      {order.cook_name}
                     </p>
                     <p style={{
                       background: 'linear-gradient(135deg, #FF6B35, #E55A24)',
@@ -305,7 +305,7 @@ function EnhancedCookDashboard() {
                   }}>
                     <h6 style={{ margin: '0 0 0.25rem 0', fontWeight: '700', color: '#212529' }}>Order #{order.id}</h6>
                     <p style={{ margin: '0 0 0.5rem 0', color: '#757575', fontSize: '0.85rem' }}><i className="bi bi-clock me-1"></i>{formatTime(order.created_at)}</p>
-                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_details?.name}</p>
+                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_name}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#757575', fontSize: '0.9rem' }}>Qty: {order.quantity} | {order.delivery_type === 'dine_in' ? 'Dine-In' : order.delivery_type === 'pickup' ? 'Pickup' : 'Delivery'}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#FF6B35', fontWeight: '700' }}>Rs. {order.total_price}</p>
                     <button
@@ -374,7 +374,7 @@ function EnhancedCookDashboard() {
                   }}>
                     <h6 style={{ margin: '0 0 0.25rem 0', fontWeight: '700', color: '#212529' }}>Order #{order.id}</h6>
                     <p style={{ margin: '0 0 0.5rem 0', color: '#757575', fontSize: '0.85rem' }}><i className="bi bi-clock me-1"></i>{formatTime(order.created_at)}</p>
-                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_details?.name}</p>
+                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_name}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#757575', fontSize: '0.9rem' }}>Qty: {order.quantity} | {order.delivery_type === 'dine_in' ? 'Dine-In' : order.delivery_type === 'pickup' ? 'Pickup' : 'Delivery'}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#FF6B35', fontWeight: '700' }}>Rs. {order.total_price}</p>
                     <button
@@ -443,7 +443,7 @@ function EnhancedCookDashboard() {
                   }}>
                     <h6 style={{ margin: '0 0 0.25rem 0', fontWeight: '700', color: '#212529' }}>Order #{order.id}</h6>
                     <p style={{ margin: '0 0 0.5rem 0', color: '#757575', fontSize: '0.85rem' }}><i className="bi bi-clock me-1"></i>{formatTime(order.created_at)}</p>
-                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_details?.name}</p>
+                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_name}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#757575', fontSize: '0.9rem' }}>Qty: {order.quantity} | {order.delivery_type === 'dine_in' ? 'Dine-In' : order.delivery_type === 'pickup' ? 'Pickup' : 'Delivery'}</p>
                     <p style={{ margin: '0 0 1rem 0', color: '#FF6B35', fontWeight: '700' }}>Rs. {order.total_price}</p>
                     <button
@@ -495,7 +495,7 @@ function EnhancedCookDashboard() {
                 fontSize: '0.9rem',
                 fontWeight: '600'
               }}>
-                {orders.completed.length}
+                {orders.counts?.completed ?? orders.completed.length}
               </span>
             </h3>
             {orders.completed.length === 0 ? (
@@ -512,12 +512,12 @@ function EnhancedCookDashboard() {
                   }}>
                     <h6 style={{ margin: '0 0 0.25rem 0', fontWeight: '700', color: '#212529' }}>Order #{order.id}</h6>
                     <p style={{ margin: '0 0 0.5rem 0', color: '#757575', fontSize: '0.85rem' }}><i className="bi bi-clock me-1"></i>{formatTime(order.created_at)}</p>
-                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_details?.name}</p>
+                    <p style={{ margin: '0 0 0.75rem 0', fontWeight: '600', color: '#212529' }}>{order.meal_name}</p>
                     <p style={{ margin: '0 0 0.75rem 0', color: '#757575', fontSize: '0.9rem' }}>Qty: {order.quantity}</p>
                     <p style={{ margin: 0, color: '#FF6B35', fontWeight: '700' }}>Rs. {order.total_price}</p>
                   </div>
                 ))}
-                {orders.completed.length > 5 && (
+                {(orders.counts?.completed ?? orders.completed.length) > 5 && (
                   <Link
                     to="/orders/history"
                     style={{
@@ -1,10 +1,13 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { mealService } from '../services/mealService';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const MyMeals = () => {
   const [meals, setMeals] = useState([]);
+  const [next, setNext] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -14,7 +17,8 @@ const MyMeals = () => {
   const fetchMyMeals = async () => {
     try {
       const data = await mealService.getMyMeals();
-      setMeals(data);
+      setMeals(data.results);
+      setNext(data.next);
     } catch (err) {
       console.error('Error fetching meals:', err);
       setError('Failed to load your meals');
@@ -23,6 +27,20 @@ const MyMeals = () => {
     }
   };
 
+  const loadMoreMeals = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await mealService.getMyMeals(next);
+      setMeals((loaded) => [...loaded, ...data.results]);
+      setNext(data.next);
+    } catch (err) {
+      console.error('Error fetching meals:', err);
+      setError('Failed to load more meals');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (id) => {
     if (!window.confirm('Are you sure you want to delete this meal?')) {
       return;
@@ -284,6 +302,8 @@ const MyMeals = () => {
             ))}
           </div>
         )}
+
+        <LoadMoreButton next={next} onLoadMore={loadMoreMeals} loading={loadingMore} />
       </div>
     </div>
   );
@@ -1,10 +1,13 @@
 import { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { orderService } from '../services/orderService';
+import LoadMoreButton from '../components/LoadMoreButton';
 
 const OrderHistory = () => {
   const [orders, setOrders] = useState([]);
+  const [next, setNext] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
 
   useEffect(() => {
@@ -14,7 +17,8 @@ const OrderHistory = () => {
   const fetchOrders = async () => {
     try {
       const data = await orderService.getOrderHistory();
-      setOrders(data);
+      setOrders(data.results);
+      setNext(data.next);
     } catch (err) {
       setError('Failed to load order history');
     } finally {
@@ -22,6 +26,19 @@ const OrderHistory = () => {
     }
   };
 
+  const loadMoreOrders = async () => {
+    setLoadingMore(true);
+    try {
+      const data = await orderService.getOrderHistory(next);
+      setOrders((loaded) => [...loaded, ...data.results]);
+      setNext(data.next);
+    } catch (err) {
+      setError('Failed to load more orders');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const getStatusBadgeClass = (status) => {
     const statusClasses = {
       pending: 'bg-warning',
@@ -157,10 +174,10 @@ const OrderHistory = () => {
                   alignItems: 'center'
                 }}>
                   {/* Meal Image */}
-                  {order.meal_details?.photo && (
+                  {order.meal_photo && (
                     <img
-                      src={order.meal_details.photo}
-                      alt={order.meal_details.name}
+                      src={order.meal_photo}
+                      alt={order.meal_name}
                       style={{
                         width: '100px',
                         height: '100px',
@@ -178,11 +195,11 @@ const OrderHistory = () => {
                       color: '#212529',
                       marginBottom: '0.5rem'
                     }}>
-                      {order.meal_details?.name}
+                      {order.meal_name}
                     </h5>
                     <p style={{ color: '#757575', fontSize: '0.95rem', marginBottom: '0.75rem' }}>
                       <i className="bi bi-person-fill me-2" style={{ color: '#FF6B35' }}></i>
-                      {order.meal_details?.cook_name}
+                      {order.cook_name}
                     </p>
                     <div style={{
                       display: 'flex',
@@ -253,6 +270,8 @@ const OrderHistory = () => {
             ))}
           </div>
         )}
+
+        <LoadMoreButton next={next} onLoadMore={loadMoreOrders} loading={loadingMore} />
       </div>
     </div>
   );
@@ -65,4 +65,16 @@ function getCookie(name) {
   return cookieValue;
 }
 
+// Paginated list endpoints return { next, results }; fetch one page so
+// screens can render it straight away and ask for `next` on demand.
+// Pass the previous page's `next` URL to load the page after it (plain
+// arrays come back as a single page)
+export async function getPage(url, config = {}, next = null) {
+  const { data } = next ? await api.get(next) : await api.get(url, config);
+  if (Array.isArray(data)) {
+    return { results: data, next: null };
+  }
+  return { results: data.results, next: data.next };
+}
+
 export default api;
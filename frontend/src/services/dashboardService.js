@@ -17,6 +17,24 @@ export const dashboardService = {
     return response.data;
   },
 
+  /**
+   * Subscribe to the cook's order events (server-sent events).
+   * Calls onEvent(name, data) for order.created, order.status_changed and
+   * resync; returns a function that closes the stream.
+   */
+  subscribeCookOrders: (onEvent, onError) => {
+    const source = new EventSource(`${api.defaults.baseURL}/dashboard/cook/orders/stream/`, {
+      withCredentials: true,
+    });
+    ['order.created', 'order.status_changed', 'resync'].forEach((name) => {
+      source.addEventListener(name, (event) => onEvent(name, JSON.parse(event.data)));
+    });
+    if (onError) {
+      source.onerror = onError;
+    }
+    return () => source.close();
+  },
+
   /**
    * Get customer dashboard statistics
    */
@@ -1,11 +1,10 @@
-import api from './api';
+import api, { getPage } from './api';
 
 export const mealService = {
-  // Get all meals
-  getMeals: async (params = {}) => {
+  // Get a page of meals ({ results, next }); pass `next` for the following page
+  getMeals: async (params = {}, next = null) => {
     try {
-      const response = await api.get('/meals/', { params });
-      return response.data;
+      return await getPage('/meals/', { params }, next);
     } catch (error) {
       throw error;
     }
@@ -22,10 +21,9 @@ export const mealService = {
   },
 
   // Get meals by cook
-  getMyMeals: async () => {
+  getMyMeals: async (next = null) => {
     try {
-      const response = await api.get('/meals/my-meals/');
-      return response.data;
+      return await getPage('/meals/my-meals/', {}, next);
     } catch (error) {
       throw error;
     }
@@ -76,12 +74,11 @@ export const mealService = {
   },
 
   // Browse meals with filters (no location)
-  browseMeals: async (filters = {}) => {
+  browseMeals: async (filters = {}, next = null) => {
     try {
-      const response = await api.get('/meals/browse/', {
+      return await getPage('/meals/browse/', {
         params: filters,
-      });
-      return response.data;
+      }, next);
     } catch (error) {
       throw error;
     }
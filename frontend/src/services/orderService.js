@@ -1,11 +1,10 @@
-import api from './api';
+import api, { getPage } from './api';
 
 export const orderService = {
-  // Get all orders
-  getOrders: async () => {
+  // Get a page of orders ({ results, next }); pass `next` for the following page
+  getOrders: async (next = null) => {
     try {
-      const response = await api.get('/orders/');
-      return response.data;
+      return await getPage('/orders/', {}, next);
     } catch (error) {
       throw error;
     }
@@ -82,30 +81,27 @@ export const orderService = {
   },
 
   // Get active orders
-  getActiveOrders: async () => {
+  getActiveOrders: async (next = null) => {
     try {
-      const response = await api.get('/orders/active/');
-      return response.data;
+      return await getPage('/orders/active/', {}, next);
     } catch (error) {
       throw error;
     }
   },
 
   // Get completed orders
-  getCompletedOrders: async () => {
+  getCompletedOrders: async (next = null) => {
     try {
-      const response = await api.get('/orders/completed/');
-      return response.data;
+      return await getPage('/orders/completed/', {}, next);
     } catch (error) {
       throw error;
     }
   },
 
   // Get order history
-  getOrderHistory: async () => {
+  getOrderHistory: async (next = null) => {
     try {
-      const response = await api.get('/orders/history/');
-      return response.data;
+      return await getPage('/orders/history/', {}, next);
     } catch (error) {
       throw error;
     }
@@ -5,6 +5,19 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+The cook order stream (/api/dashboard/cook/orders/stream/) holds its
+connection open, so production serves this ASGI entry point rather than
+wsgi.py (see Procfile and railway.toml):
+
+    gunicorn homebite.asgi:application -k uvicorn.workers.UvicornWorker
+
+Under a sync WSGI worker every open stream would pin a whole worker.
+
+Order events are fanned out by the in-process broker in homebite.events,
+which only reaches subscribers in the worker that saved the order. Run
+stream traffic on a single worker, or swap the broker for a shared one
+(such as Redis pub/sub) before scaling out.
 """
 
 import os
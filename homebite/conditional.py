@@ -0,0 +1,67 @@
+"""Conditional GET (ETag / Last-Modified) for catalogue endpoints."""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering unchanged listings with ``304 Not Modified``.
+
+    The validators come from one aggregate over the queryset being served:
+    the newest ``updated_at`` and the row count (which catches deletions).
+    The ETag also covers the full request path and the negotiated renderer,
+    so each page, filter and format gets its own tag. Writes that bypass
+    ``save()`` must set ``updated_at`` themselves.
+
+    Responses that depend on the requesting user (``vary_on`` is given)
+    also carry ``Vary: Authorization, Cookie`` so shared caches keep them
+    apart.
+    """
+
+    last_modified_field = 'updated_at'
+
+    def get_validators(self, queryset, vary_on=()):
+        """
+        Return ``(etag, last_modified)`` for ``queryset``; ``vary_on`` adds
+        any other inputs the response depends on to the ETag.
+        """
+        version = queryset.order_by().aggregate(
+            last_modified=Max(self.last_modified_field),
+            count=Count('pk')
+        )
+        last_modified = version['last_modified']
+        digest = hashlib.md5(
+            '|'.join([
+                last_modified.isoformat() if last_modified else '',
+                str(version['count']),
+                self.request.get_full_path(),
+                self.request.accepted_renderer.format,
+                *(str(value) for value in vary_on),
+            ]).encode('utf-8'),
+            usedforsecurity=False
+        ).hexdigest()
+        return f'"{digest}"', last_modified
+
+    def conditional_response(self, queryset, build_response, vary_on=()):
+        """
+        Return 304 if the client's validators still match ``queryset``;
+        otherwise return ``build_response()`` with ETag/Last-Modified set.
+        """
+        etag, last_modified = self.get_validators(queryset, vary_on)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=timestamp
+        )
+        if response is None:
+            response = build_response()
+            if response.status_code == 200:
+                response['ETag'] = etag
+                if timestamp is not None:
+                    response['Last-Modified'] = http_date(timestamp)
+        if vary_on:
+            patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
@@ -0,0 +1,101 @@
+"""
+In-process publish/subscribe for server-sent events.
+
+Publishers are ordinary (sync) Django code, such as the order signal
+handlers; subscribers are async SSE views running on the ASGI event loop.
+``publish`` hands each message to the subscriber's loop with
+``call_soon_threadsafe``, so it is safe to call from any thread.
+
+This broker only reaches subscribers in the same process, which is enough
+for a single ASGI worker (see homebite/asgi.py). With several workers it
+stands in for a shared broker such as Redis pub/sub: ``publish`` and
+``subscribe`` are the whole interface to replace.
+"""
+import asyncio
+import itertools
+import threading
+from collections import defaultdict, namedtuple
+from contextlib import asynccontextmanager
+
+
+Event = namedtuple('Event', ['id', 'name', 'data'])
+
+# Delivered in place of dropped events when a subscriber falls behind
+OVERFLOW = 'resync'
+
+
+class Subscription:
+    """One subscriber's bounded queue, fed from any thread."""
+
+    def __init__(self, loop, max_queue):
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._overflowed = False
+
+    def deliver(self, event):
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The subscriber's event loop has closed
+            pass
+
+    def _put(self, event):
+        if self._overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog and tell the client to refetch instead
+            self._overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(Event(event.id, OVERFLOW, {}))
+
+    async def get(self, timeout=None):
+        """Next event, or None if ``timeout`` seconds pass without one."""
+        try:
+            event = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event.name == OVERFLOW:
+            self._overflowed = False
+        return event
+
+
+class EventBroker:
+    """Fan-out of named events to the subscribers of a channel."""
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def publish(self, channel, name, data):
+        """Send an event to every current subscriber of ``channel``."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+            event = Event(next(self._ids), name, data)
+        for subscription in subscriptions:
+            subscription.deliver(event)
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        """Async context manager yielding a Subscription to ``channel``."""
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self._subscriptions[channel].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscriptions[channel].discard(subscription)
+                if not self._subscriptions[channel]:
+                    del self._subscriptions[channel]
+
+
+broker = EventBroker()
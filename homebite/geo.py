@@ -0,0 +1,57 @@
+"""Geographic helpers shared by the location-aware meal lookups."""
+from math import cos, radians
+
+import numpy as np
+
+
+KM_PER_DEGREE_LAT = 111.32
+EARTH_RADIUS_KM = 6371.0
+
+
+def bounding_box(lat, lng, radius_km):
+    """
+    Return ``(min_lat, max_lat, min_lng, max_lng)`` enclosing a circle.
+
+    Longitude bounds are not wrapped, so boxes crossing the antimeridian
+    extend beyond +/-180.
+    """
+    lat, lng = float(lat), float(lng)
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    # Clamp the cosine so the box stays finite close to the poles
+    dlng = radius_km / (KM_PER_DEGREE_LAT * max(cos(radians(lat)), 0.01))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def _coordinate_array(values, limit):
+    """Convert coordinates to a float array, with NaN for missing or out-of-range values."""
+    array = np.array(values, dtype=float, ndmin=1)
+    array[~(np.abs(array) <= limit)] = np.nan
+    return array
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """
+    Calculate great circle distances from one point to many points at once.
+
+    ``lats``/``lngs`` may be any sequence of numbers, Decimals or None.
+    Returns a float array of distances in kilometers; entries whose
+    coordinates are missing or invalid (on either side) are NaN.
+    """
+    lats = np.radians(_coordinate_array(lats, 90))
+    lngs = np.radians(_coordinate_array(lngs, 180))
+    if lat is None or lng is None:
+        return np.full(lats.shape, np.nan)
+    lat0 = np.radians(_coordinate_array(lat, 90)[0])
+    lng0 = np.radians(_coordinate_array(lng, 180)[0])
+
+    a = (
+        np.sin((lats - lat0) / 2) ** 2
+        + np.cos(lat0) * np.cos(lats) * np.sin((lngs - lng0) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Distance between two points in kilometers, or None if either is invalid."""
+    distance = haversine_km(lat1, lng1, [lat2], [lng2])[0]
+    return None if np.isnan(distance) else float(distance)
@@ -0,0 +1,160 @@
+"""Keyset (cursor) pagination for HomeBite list endpoints."""
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opaque cursor pagination over the queryset's ordering.
+
+    Querysets ordered by model fields (``-created_at`` by default) are paged
+    by keyset: the cursor carries the last row's ordering values plus its id,
+    so each page is one indexed range scan no matter how deep it is.
+    Orderings that are not plain fields, such as search relevance, fall back
+    to an offset carried in the same opaque cursor.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    default_ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        page_size = settings.API_PAGE_SIZE
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        return min(requested, self.max_page_size) if requested > 0 else page_size
+
+    def get_ordering(self, queryset):
+        """Return the keyset ordering, or None if the queryset must be paged by offset."""
+        ordering = list(queryset.query.order_by) or list(self.default_ordering)
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str):
+                return None
+            name = item.lstrip('-')
+            if name == 'pk':
+                name = queryset.model._meta.pk.name
+                item = item.replace('pk', name)
+            try:
+                field = queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null:
+                return None
+            fields.append(item)
+        pk_name = queryset.model._meta.pk.name
+        if not any(item.lstrip('-') == pk_name for item in fields):
+            fields.append(f'-{pk_name}' if fields[-1].startswith('-') else pk_name)
+        return fields
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, cursor):
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _keyset_filter(self, queryset, ordering, values):
+        """Rows strictly after ``values`` in ``ordering`` (lexicographic)."""
+        condition = Q()
+        for index, item in enumerate(ordering):
+            name = item.lstrip('-')
+            field = queryset.model._meta.get_field(name)
+            try:
+                value = field.to_python(values[index])
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            step = Q(**{f"{name}__{'lt' if item.startswith('-') else 'gt'}": value})
+            for previous, previous_value in zip(ordering[:index], values[:index]):
+                previous_name = previous.lstrip('-')
+                previous_field = queryset.model._meta.get_field(previous_name)
+                step &= Q(**{previous_name: previous_field.to_python(previous_value)})
+            condition |= step
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.request = request
+        cursor = self.decode_cursor(request)
+        ordering = self.get_ordering(queryset)
+
+        if ordering is None:
+            offset = cursor.get('o', 0) if isinstance(cursor, dict) else 0
+            if not isinstance(offset, int) or offset < 0:
+                raise NotFound(self.invalid_cursor_message)
+            rows = list(queryset[offset:offset + self.page_size + 1])
+            self.next_cursor = {'o': offset + self.page_size}
+        else:
+            queryset = queryset.order_by(*ordering)
+            if cursor is not None:
+                values = cursor.get('k') if isinstance(cursor, dict) else None
+                if not isinstance(values, list) or len(values) != len(ordering):
+                    raise NotFound(self.invalid_cursor_message)
+                queryset = queryset.filter(self._keyset_filter(queryset, ordering, values))
+            rows = list(queryset[:self.page_size + 1])
+            if rows:
+                last = rows[min(len(rows), self.page_size) - 1]
+                self.next_cursor = {'k': [
+                    self._cursor_value(last, item.lstrip('-')) for item in ordering
+                ]}
+
+        self.has_next = len(rows) > self.page_size
+        return rows[:self.page_size]
+
+    @staticmethod
+    def _cursor_value(instance, name):
+        value = getattr(instance, instance._meta.get_field(name).attname)
+        return value if isinstance(value, (int, float, str, bool)) else str(value)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class KeysetPaginationMixin:
+    """ViewSet mixin paginating ``list`` and custom list actions by keyset."""
+
+    pagination_class = KeysetPagination
+
+    def paginated_response(self, queryset):
+        """Serialize one page of ``queryset`` with the view's serializer."""
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
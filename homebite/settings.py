@@ -104,6 +104,49 @@ else:
         }
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # Take the write lock at BEGIN and wait for it, so concurrent order
+    # placement queues up instead of failing with "database is locked".
+    # Tests use a file database: in-memory SQLite shares one cache between
+    # threads and fails concurrent writers outright.
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 20,
+    })
+    DATABASES['default'].setdefault('TEST', {}).setdefault('NAME', BASE_DIR / 'test_db.sqlite3')
+
+# Caches
+# The 'nearby' cache holds tile-keyed nearby-meal payloads (see meals.nearby_cache).
+# NEARBY_CACHE_BACKEND: 'locmem' (per worker, default), 'file' (shared by the
+# workers on one host) or 'redis' (REDIS_URL, requires the redis package)
+NEARBY_CACHE_BACKEND = os.environ.get('NEARBY_CACHE_BACKEND', 'locmem')
+NEARBY_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'homebite-nearby',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('NEARBY_CACHE_LOCATION', str(BASE_DIR / '.cache' / 'nearby')),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+    'redis': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'nearby': {
+        **NEARBY_CACHE_BACKENDS[NEARBY_CACHE_BACKEND],
+        'TIMEOUT': int(os.environ.get('NEARBY_CACHE_TIMEOUT', 60)),
+        'KEY_PREFIX': 'homebite',
+    },
+}
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -160,6 +203,20 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Default page size for homebite.pagination.KeysetPagination
+# (clients may pass ?page_size=, up to 100)
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', 20))
+
+# Seconds between keepalive comments on idle server-sent event streams
+SSE_KEEPALIVE_SECONDS = int(os.environ.get('SSE_KEEPALIVE_SECONDS', 15))
+
+# How long a stored Idempotency-Key response is replayed (see orders.idempotency)
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+# Rows fetched per database round trip by ?stream=true list responses
+# (see homebite.streaming)
+STREAM_CHUNK_SIZE = int(os.environ.get('STREAM_CHUNK_SIZE', 500))
+
 # CORS settings
 # Allow requests from frontend applications
 # Support all Vercel deployments (production, preview, branch deployments)
@@ -190,6 +247,7 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
 
 # CSRF configuration - Use regex patterns for dynamic domains
@@ -224,3 +282,25 @@ SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 # Distance settings (in kilometers)
 DEFAULT_SEARCH_RADIUS_KM = 2.0
 MAX_SEARCH_RADIUS_KM = 5.0
+
+# Seconds before a worker rebuilds its in-memory kitchen index, so cook
+# changes saved by other workers become visible (see accounts.kitchen_index)
+KITCHEN_INDEX_TTL_SECONDS = int(os.environ.get('KITCHEN_INDEX_TTL_SECONDS', 300))
+
+# Weights of the ?sort_by=relevance meal ranking (see meals.ranking)
+MEAL_RANKING_WEIGHTS = {
+    'distance': 0.4,
+    'cook_rating': 0.25,
+    'meal_rating': 0.2,
+    'price': 0.15,
+}
+
+# Facet buckets for meal browse (see meals.facets); price bands are
+# [min, max) in PKR, None meaning no upper bound
+MEAL_PRICE_BANDS = [(0, 200), (200, 500), (500, 1000), (1000, None)]
+MEAL_DISTANCE_RINGS_KM = [1, 2, 5]
+
+# /api/meals/suggest/ typeahead (see meals.suggest)
+SUGGEST_LIMIT = 10
+SUGGEST_MAX_LIMIT = 25
+SUGGEST_INDEX_TTL_SECONDS = int(os.environ.get('SUGGEST_INDEX_TTL_SECONDS', 300))
@@ -0,0 +1,81 @@
+"""Streaming JSON responses for large list endpoints."""
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def _encoder():
+    return JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def iter_json_array(rows, serialize):
+    """Yield a JSON array of ``serialize(row)`` for each row, one element at a time."""
+    encoder = _encoder()
+    yield '['
+    first = True
+    for row in rows:
+        if not first:
+            yield ','
+        yield encoder.encode(serialize(row))
+        first = False
+    yield ']'
+
+
+async def stream_json_array(rows, serialize, chunk_size):
+    """
+    Async version of iter_json_array for ASGI servers.
+
+    Rows are fetched and serialized ``chunk_size`` at a time in the
+    request's sync thread, so the event loop only ever waits on whole
+    chunks and the queryset's cursor stays on the thread that opened it.
+    """
+    encoder = _encoder()
+    rows = iter(rows)
+
+    def next_chunk():
+        return [encoder.encode(serialize(row)) for row in islice(rows, chunk_size)]
+
+    yield '['
+    separator = ''
+    while chunk := await sync_to_async(next_chunk)():
+        yield separator + ','.join(chunk)
+        separator = ','
+    yield ']'
+
+
+class StreamingListMixin:
+    """
+    ViewSet mixin that can stream a whole list as a JSON array.
+
+    ``?stream=true`` opts in: the queryset is read with ``.iterator()`` in
+    STREAM_CHUNK_SIZE batches and each row is serialized and written as it
+    is fetched, so memory stays flat however many rows there are. Elements
+    are the same objects the paginated endpoint returns under ``results``.
+    Under ASGI the body is an async iterator; a sync one would be buffered
+    whole by the handler before the first byte is sent.
+    """
+
+    stream_query_param = 'stream'
+
+    def stream_requested(self):
+        return self.request.query_params.get(self.stream_query_param) == 'true'
+
+    def streaming_response(self, queryset):
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        rows = queryset.iterator(chunk_size=settings.STREAM_CHUNK_SIZE)
+
+        def serialize(instance):
+            return serializer_class(instance, context=context).data
+
+        if isinstance(self.request._request, ASGIRequest):
+            content = stream_json_array(rows, serialize, settings.STREAM_CHUNK_SIZE)
+        else:
+            content = iter_json_array(rows, serialize)
+        response = StreamingHttpResponse(content, content_type='application/json')
+        response['X-Accel-Buffering'] = 'no'
+        return response
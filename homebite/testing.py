@@ -0,0 +1,36 @@
+"""Fixtures shared by the apps' test suites."""
+from datetime import time
+
+from accounts.models import CookProfile, CustomerProfile, User
+from meals.models import Meal
+
+
+def create_cook(username='cook', **profile_fields):
+    """Create an approved cook and return their CookProfile."""
+    user = User.objects.create_user(
+        username, f'{username}@example.com', None, role='cook', is_approved=True
+    )
+    cook, _ = CookProfile.objects.get_or_create(user=user)
+    if profile_fields:
+        for field, value in profile_fields.items():
+            setattr(cook, field, value)
+        cook.save()
+    return cook
+
+
+def create_customer(username='customer', **user_fields):
+    """Create an approved customer and return their CustomerProfile."""
+    user = User.objects.create_user(
+        username, f'{username}@example.com', None, role='customer', is_approved=True, **user_fields
+    )
+    customer, _ = CustomerProfile.objects.get_or_create(user=user)
+    return customer
+
+
+def create_meal(cook, name='Biryani', **fields):
+    """Create an approved, active meal for ``cook``; ``fields`` override the defaults."""
+    fields = {
+        'price': 250, 'quantity_available': 10, 'ready_time': time(12),
+        'is_active': True, 'is_approved': True, **fields,
+    }
+    return Meal.objects.create(cook=cook, name=name, **fields)
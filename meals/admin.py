@@ -32,21 +32,21 @@ class MealAdmin(admin.ModelAdmin):
     
     @admin.action(description='Approve selected meals')
     def approve_meals(self, request, queryset):
-        updated = queryset.update(is_approved=True)
+        updated = queryset.update_listing(is_approved=True)
         self.message_user(request, f'{updated} meal(s) approved.')
     
     @admin.action(description='Reject selected meals (set is_approved=False)')
     def reject_meals(self, request, queryset):
-        updated = queryset.update(is_approved=False)
+        updated = queryset.update_listing(is_approved=False)
         self.message_user(request, f'{updated} meal(s) rejected.')
     
     @admin.action(description='Disable selected meals')
     def disable_meals(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = queryset.update_listing(is_active=False)
         self.message_user(request, f'{updated} meal(s) disabled.')
     
     @admin.action(description='Enable selected meals')
     def enable_meals(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        updated = queryset.update_listing(is_active=True)
         self.message_user(request, f'{updated} meal(s) enabled.')
 
@@ -1,17 +1,28 @@
+from django.conf import settings
+from django.db.models import Q
 from rest_framework import viewsets, filters, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from . import nearby_cache, ranking
 from .models import Meal
+from .facets import meal_facets
+from .filters import MealSearchFilter
 from .serializers import MealSerializer, MealListSerializer
-from homebite.utils import get_nearby_meals
+from .suggest import suggest_index
+from accounts.kitchen_index import kitchen_index
+from homebite.conditional import ConditionalGetMixin
+from homebite.geo import haversine_km
+from homebite.pagination import KeysetPaginationMixin
+from homebite.streaming import StreamingListMixin
+from homebite.utils import get_meals_near, get_nearby_meals
 
 
-class MealViewSet(viewsets.ModelViewSet):
+class MealViewSet(KeysetPaginationMixin, StreamingListMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Meal.objects.filter(is_active=True, is_approved=True).select_related('cook', 'cook__user')
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['name', 'description']
+    # Search runs last so relevance ranking wins over the default ordering
+    filter_backends = [filters.OrderingFilter, MealSearchFilter]
     ordering_fields = ['price', 'created_at']
     ordering = ['-created_at']
 
@@ -28,6 +39,17 @@ class MealViewSet(viewsets.ModelViewSet):
                 return Meal.objects.filter(cook=self.request.user.cook_profile)
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional_response(queryset, lambda: self.paginated_response(queryset))
+    
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        queryset = self.get_queryset().filter(pk=instance.pk)
+        return self.conditional_response(
+            queryset, lambda: Response(self.get_serializer(instance).data)
+        )
+    
     def perform_create(self, serializer):
         if self.request.user.role != 'cook' or not hasattr(self.request.user, 'cook_profile'):
             from rest_framework.exceptions import PermissionDenied
@@ -46,40 +68,140 @@ class MealViewSet(viewsets.ModelViewSet):
             cook=request.user.cook_profile,
             quantity_available__gt=0
         ).order_by('-created_at')
-        serializer = self.get_serializer(meals, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(meals)
 
+    def get_feed_limit(self, default):
+        """Parse ``?limit=`` for ranked feeds (capped like page sizes)."""
+        try:
+            limit = int(self.request.query_params['limit'])
+        except (KeyError, ValueError):
+            return default
+        return max(0, min(limit, self.pagination_class.max_page_size))
+    
+    def get_customer_location(self):
+        """The requesting customer's saved location, or (None, None)."""
+        profile = getattr(self.request.user, 'customer_profile', None)
+        if profile is None or not profile.location_lat or not profile.location_lng:
+            return None, None
+        return profile.location_lat, profile.location_lng
+    
+    def ranked_response(self, meals):
+        """Top ``?limit=`` meals by the weighted ranking in meals.ranking."""
+        cook_distances = {}
+        max_distance = None
+        lat, lng = self.get_customer_location()
+        if lat is not None:
+            max_distance = settings.MAX_SEARCH_RADIUS_KM
+            cook_distances = kitchen_index.cooks_within(lat, lng, max_distance)
+        
+        ranked = ranking.top_k(
+            meals, self.get_feed_limit(settings.API_PAGE_SIZE),
+            ranking.meal_features(cook_distances), max_distance_km=max_distance
+        )
+        for meal in ranked:
+            meal.distance_km = (
+                round(cook_distances[meal.cook_id], 2) if meal.cook_id in cook_distances else None
+            )
+        serializer = self.get_serializer(ranked, many=True)
+        return Response({'next': None, 'results': serializer.data})
+    
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """Typeahead suggestions for meal names and cook usernames."""
+        query = request.query_params.get('q', '')
+        try:
+            limit = int(request.query_params.get('limit', settings.SUGGEST_LIMIT))
+        except ValueError:
+            limit = settings.SUGGEST_LIMIT
+        limit = max(0, min(limit, settings.SUGGEST_MAX_LIMIT))
+        return Response(suggest_index.suggest(query, limit))
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def nearby(self, request):
         """Get nearby meals based on customer's office location."""
         if request.user.role != 'customer' or not hasattr(request.user, 'customer_profile'):
             return Response({'error': 'Only customers can view nearby meals'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Get max distance from query params (default 2km)
+        # Get max distance from query params (default 2km, capped at MAX_SEARCH_RADIUS_KM)
         max_distance = float(request.query_params.get('max_distance', 2))
+        max_distance = min(max_distance, settings.MAX_SEARCH_RADIUS_KM)
+        
+        profile = request.user.customer_profile
+        if not profile.location_lat or not profile.location_lng:
+            serializer = MealListSerializer(get_nearby_meals(profile, max_distance), many=True)
+            return Response(serializer.data)
+        
+        # Customers in the same tile share one cached payload, built around
+        # the tile centre (see meals.nearby_cache); it keeps each meal's
+        # kitchen location so distances can be measured from the customer
+        def compute(tile_lat, tile_lng, radius_km):
+            nearby_meals = get_meals_near(tile_lat, tile_lng, radius_km)
+            return {
+                'kitchens': [
+                    (meal.cook.kitchen_location_lat, meal.cook.kitchen_location_lng)
+                    for meal in nearby_meals
+                ],
+                'meals': MealListSerializer(nearby_meals, many=True).data,
+            }
         
-        # Get nearby meals using haversine formula
-        nearby_meals = get_nearby_meals(request.user.customer_profile, max_distance)
+        payload = nearby_cache.get_nearby_payload(
+            profile.location_lat, profile.location_lng, max_distance, compute
+        )
+        lats = [lat for lat, _ in payload['kitchens']]
+        lngs = [lng for _, lng in payload['kitchens']]
+        distances = haversine_km(profile.location_lat, profile.location_lng, lats, lngs)
+        nearby_meals = sorted(
+            (
+                {**meal, 'distance_km': round(float(distance), 2)}
+                for meal, distance in zip(payload['meals'], distances)
+                if distance <= max_distance
+            ),
+            key=lambda meal: meal['distance_km']
+        )
         
-        serializer = MealListSerializer(nearby_meals, many=True)
-        return Response(serializer.data)
+        if request.query_params.get('sort_by') == 'relevance':
+            nearby_meals = ranking.top_k(
+                nearby_meals, self.get_feed_limit(len(nearby_meals)),
+                ranking.payload_features, max_distance_km=max_distance
+            )
+        return Response(nearby_meals)
     
     @action(detail=False, methods=['get'])
     def browse(self, request):
         """Browse all available meals (no location filter)."""
-        meals = self.get_queryset()
+        available = self.get_queryset()
         
         # Apply additional filters from query params
         min_price = request.query_params.get('min_price')
         max_price = request.query_params.get('max_price')
         dine_in = request.query_params.get('dine_in')
         
+        price_filter = Q()
+        dine_in_filter = Q()
         if min_price:
-            meals = meals.filter(price__gte=min_price)
+            price_filter &= Q(price__gte=min_price)
         if max_price:
-            meals = meals.filter(price__lte=max_price)
+            price_filter &= Q(price__lte=max_price)
         if dine_in == 'true':
-            meals = meals.filter(dine_with_us_available=True)
+            dine_in_filter = Q(dine_with_us_available=True)
+        
+        meals = available.filter(price_filter & dine_in_filter).order_by('-created_at', '-id')
+        ranked = request.query_params.get('sort_by') == 'relevance'
+        if self.stream_requested() and not ranked:
+            return self.conditional_response(meals, lambda: self.streaming_response(meals))
+        
+        # Rankings and distance facets depend on the customer's location
+        location = self.get_customer_location()
+        
+        def build_response():
+            response = self.ranked_response(meals) if ranked else self.paginated_response(meals)
+            # Facets describe the whole listing, so only the first page carries them
+            if self.paginator.cursor_query_param not in request.query_params:
+                response.data['facets'] = meal_facets(
+                    available, *location, price_filter=price_filter, dine_in_filter=dine_in_filter
+                )
+            return response
         
-        serializer = self.get_serializer(meals, many=True)
-        return Response(serializer.data)
+        # Validate over every available meal: the facets count the meals the
+        # price and dine-in filters leave out, so those changes must show too
+        return self.conditional_response(available, build_response, vary_on=location)
@@ -0,0 +1,89 @@
+"""
+Facet counts for the meal browse sidebar.
+
+All counts come from one grouped query: meals are grouped by cook, with a
+conditional Count per price band and for dine-in. Each facet is counted
+with every active filter except its own, so the price bands still show the
+other bands while one is selected. Distance rings are then derived from
+the per-cook rows in one vectorized haversine pass, weighted by each
+cook's filtered meal count.
+"""
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Q
+
+from homebite.geo import haversine_km
+
+
+def _band_label(low, high):
+    return f'{low}-{high}' if high is not None else f'{low}+'
+
+
+def _band_filter(low, high):
+    condition = Q(price__gte=low)
+    if high is not None:
+        condition &= Q(price__lt=high)
+    return condition
+
+
+def meal_facets(queryset, lat=None, lng=None, price_filter=Q(), dine_in_filter=Q()):
+    """
+    Return facet counts for a Meal queryset.
+
+    ``queryset`` is the listing before the price and dine-in filters, which
+    are passed as ``price_filter``/``dine_in_filter`` instead. ``price``
+    counts meals per MEAL_PRICE_BANDS band, ``dine_in`` splits meals by
+    dine-in availability and ``distance`` counts meals within each
+    MEAL_DISTANCE_RINGS_KM ring of (lat, lng). Rings are cumulative and are
+    None when no location is given.
+    """
+    bands = settings.MEAL_PRICE_BANDS
+    aggregates = {
+        f'band_{index}': Count('id', filter=_band_filter(low, high) & dine_in_filter)
+        for index, (low, high) in enumerate(bands)
+    }
+    rows = list(
+        queryset.order_by()
+        .values('cook_id', 'cook__kitchen_location_lat', 'cook__kitchen_location_lng')
+        .annotate(
+            total=Count('id', filter=price_filter & dine_in_filter),
+            priced=Count('id', filter=price_filter),
+            dine_in=Count('id', filter=price_filter & Q(dine_with_us_available=True)),
+            **aggregates
+        )
+    )
+
+    total = sum(row['total'] for row in rows)
+    priced = sum(row['priced'] for row in rows)
+    dine_in = sum(row['dine_in'] for row in rows)
+    facets = {
+        'total': total,
+        'price': [
+            {
+                'label': _band_label(low, high),
+                'min': low,
+                'max': high,
+                'count': sum(row[f'band_{index}'] for row in rows),
+            }
+            for index, (low, high) in enumerate(bands)
+        ],
+        'dine_in': {'available': dine_in, 'unavailable': priced - dine_in},
+        'distance': None,
+    }
+
+    if lat is not None and lng is not None:
+        distances = haversine_km(
+            lat, lng,
+            [row['cook__kitchen_location_lat'] for row in rows],
+            [row['cook__kitchen_location_lng'] for row in rows]
+        )
+        counts = np.array([row['total'] for row in rows], dtype=int)
+        facets['distance'] = [
+            {
+                'within_km': ring,
+                # NaN distances (kitchens without a location) compare False
+                'count': int(counts[distances <= ring].sum()),
+            }
+            for ring in settings.MEAL_DISTANCE_RINGS_KM
+        ]
+    return facets
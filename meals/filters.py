@@ -0,0 +1,22 @@
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .search import search_meals
+
+
+class MealSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index (see meals.search).
+
+    Results are ranked by relevance unless the client asks for an explicit
+    ``?ordering=``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        results = search_meals(queryset, ' '.join(terms))
+        if api_settings.ORDERING_PARAM in request.query_params:
+            results = results.order_by(*queryset.query.order_by)
+        return results
@@ -55,6 +55,7 @@ class MealFilterForm(forms.Form):
         ('price_low', 'Price (Low to High)'),
         ('price_high', 'Price (High to Low)'),
         ('rating', 'Rating (Highest)'),
+        ('relevance', 'Best Match'),
     ]
     
     max_distance = forms.DecimalField(
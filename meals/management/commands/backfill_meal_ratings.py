@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from meals.models import Meal
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized meal rating totals (rating_sum, rating_count) from ratings'
+
+    def handle(self, *args, **options):
+        updated = Meal.objects.all().refresh_rating_stats()
+        self.stdout.write(self.style.SUCCESS(f'✅ Refreshed rating totals for {updated} meal(s)'))
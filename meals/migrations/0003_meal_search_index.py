@@ -0,0 +1,67 @@
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.db import OperationalError, migrations
+
+
+# Frozen copy of the index SQL in meals.search this migration was written against
+FTS_TABLE = 'meals_meal_fts'
+
+SEARCH_VECTOR_GIN = GinIndex(fields=['search_vector'], name='meals_meal_search_vector_gin')
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('meals', 'Meal'), SEARCH_VECTOR_GIN)
+        schema_editor.execute(
+            'UPDATE meals_meal SET search_vector = '
+            "setweight(to_tsvector('simple', meals_meal.name), 'A') || "
+            "setweight(to_tsvector('simple', accounts_user.username), 'B') || "
+            "setweight(to_tsvector('simple', meals_meal.description), 'C') "
+            'FROM accounts_cookprofile, accounts_user '
+            'WHERE accounts_cookprofile.id = meals_meal.cook_id '
+            'AND accounts_user.id = accounts_cookprofile.user_id'
+        )
+    elif connection.vendor == 'sqlite':
+        try:
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                f"name, description, cook_username, tokenize='unicode61 remove_diacritics 2')"
+            )
+        except OperationalError:
+            # SQLite built without FTS5: search_meals() falls back to icontains
+            return
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description, cook_username) '
+            'SELECT meals_meal.id, meals_meal.name, meals_meal.description, accounts_user.username '
+            'FROM meals_meal '
+            'JOIN accounts_cookprofile ON accounts_cookprofile.id = meals_meal.cook_id '
+            'JOIN accounts_user ON accounts_user.id = accounts_cookprofile.user_id'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.remove_index(apps.get_model('meals', 'Meal'), SEARCH_VECTOR_GIN)
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0002_meal_dine_price_meal_dine_with_us_available'),
+        ('accounts', '0002_remove_customerprofile_office_address_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The GIN index is PostgreSQL-only, so it is kept out of Meal.Meta
+        # (SQLite rebuilds tables from Meta.indexes)
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
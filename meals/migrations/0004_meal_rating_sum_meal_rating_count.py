@@ -0,0 +1,38 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_totals(apps, schema_editor):
+    Meal = apps.get_model('meals', 'Meal')
+    Rating = apps.get_model('ratings', 'Rating')
+    ratings = Rating.objects.filter(meal=models.OuterRef('pk')).values('meal')
+    Meal.objects.update(
+        rating_sum=Coalesce(
+            models.Subquery(ratings.annotate(total=models.Sum('meal_rating')).values('total')), 0
+        ),
+        rating_count=Coalesce(
+            models.Subquery(ratings.annotate(total=models.Count('id')).values('total')), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0003_meal_search_index'),
+        ('ratings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meal',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='meal',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rating_totals, migrations.RunPython.noop),
+    ]
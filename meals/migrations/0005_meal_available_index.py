@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0004_meal_rating_sum_meal_rating_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='meal',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_approved', True), ('quantity_available__gt', 0)), fields=['-created_at', '-updated_at'], name='meal_available_idx'),
+        ),
+    ]
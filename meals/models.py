@@ -1,6 +1,135 @@
-from django.db import models
+from functools import partial
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from accounts.models import CookProfile
+from . import nearby_cache
+from .suggest import suggest_index
+
+
+class MealQuerySet(models.QuerySet):
+    """Query helpers for meal listings."""
+    
+    def available(self):
+        """Meals that can currently be ordered from approved, active cooks."""
+        return self.filter(
+            is_active=True,
+            is_approved=True,
+            quantity_available__gt=0,
+            cook__user__is_approved=True,
+            cook__user__is_active=True
+        )
+    
+    def refresh_rating_stats(self):
+        """Recompute rating_sum/rating_count from the ratings table; returns rows updated."""
+        from ratings.models import Rating
+        
+        ratings = Rating.objects.filter(meal=models.OuterRef('pk')).values('meal')
+        return self.update(
+            rating_sum=Coalesce(
+                models.Subquery(ratings.annotate(total=models.Sum('meal_rating')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                models.Subquery(ratings.annotate(total=models.Count('id')).values('total')),
+                0
+            ),
+            updated_at=timezone.now()
+        )
+    
+    def take_portions(self, quantities):
+        """
+        Take portions from several meals in one conditional UPDATE.
+        
+        ``quantities`` maps meal id to portions. Only meals that still have
+        enough stock are decremented, and meals that reach zero are marked
+        sold out in the same statement, so concurrent orders cannot
+        oversell. Returns the number of meals updated; callers needing
+        all-or-nothing compare it with ``len(quantities)`` inside a
+        transaction.
+        """
+        if not quantities:
+            return 0
+        enough_stock = models.Q()
+        for meal_id, amount in quantities.items():
+            enough_stock |= models.Q(pk=meal_id, quantity_available__gte=amount)
+        updated = self.filter(enough_stock).update(
+            # Listed first: every SET expression must see the old quantity
+            is_active=models.Case(
+                *(
+                    models.When(pk=meal_id, quantity_available=amount, then=models.Value(False))
+                    for meal_id, amount in quantities.items()
+                ),
+                default=models.F('is_active'),
+                output_field=models.BooleanField()
+            ),
+            quantity_available=models.Case(
+                *(
+                    models.When(pk=meal_id, then=models.F('quantity_available') - amount)
+                    for meal_id, amount in quantities.items()
+                ),
+                default=models.F('quantity_available'),
+                output_field=models.PositiveIntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+        if updated:
+            self._stock_changed(quantities)
+        return updated
+    
+    def restock(self, quantities):
+        """
+        Return portions to several meals in one UPDATE, e.g. for cancelled orders.
+        
+        ``quantities`` maps meal id to portions. Restocked meals are marked
+        active again, like Order.cancel does. Returns the number of meals updated.
+        """
+        quantities = {meal_id: amount for meal_id, amount in quantities.items() if amount > 0}
+        if not quantities:
+            return 0
+        updated = self.filter(pk__in=quantities).update(
+            quantity_available=models.Case(
+                *(
+                    models.When(pk=meal_id, then=models.F('quantity_available') + amount)
+                    for meal_id, amount in quantities.items()
+                ),
+                default=models.F('quantity_available'),
+                output_field=models.PositiveIntegerField()
+            ),
+            is_active=True,
+            updated_at=timezone.now()
+        )
+        if updated:
+            self._stock_changed(quantities, availability_changed=True)
+        return updated
+    
+    def update_listing(self, **fields):
+        """
+        update() for listing changes made in bulk, e.g. by admin actions.
+        
+        Bumps updated_at for the catalogue validators and invalidates the
+        nearby and suggestion caches that the Meal signals would have.
+        Returns the number of meals updated.
+        """
+        meal_ids = list(self.values_list('pk', flat=True))
+        updated = self.model.objects.filter(pk__in=meal_ids).update(updated_at=timezone.now(), **fields)
+        if updated:
+            self._stock_changed(meal_ids, availability_changed=True)
+        return updated
+    
+    def _stock_changed(self, meal_ids, availability_changed=False):
+        """
+        Invalidate the caches update() bypasses (see meals.signals); sold-out
+        meals count as an availability change.
+        """
+        rows = list(self.model.objects.filter(pk__in=meal_ids).values_list(
+            'cook__kitchen_location_lat', 'cook__kitchen_location_lng', 'is_active'
+        ))
+        for lat, lng in {(lat, lng) for lat, lng, _ in rows}:
+            transaction.on_commit(partial(nearby_cache.invalidate_kitchen, lat, lng))
+        if availability_changed or any(not is_active for _, _, is_active in rows):
+            transaction.on_commit(suggest_index.invalidate)
 
 
 class Meal(models.Model):
@@ -29,15 +158,44 @@ class Meal(models.Model):
         help_text='Price for dine-in (PKR)'
     )
     
+    # Denormalized meal rating totals, maintained by ratings.signals
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    RATING_TOTAL_FIELDS = ('rating_sum', 'rating_count')
+    
+    # Weighted full-text document, maintained by meals.search on PostgreSQL
+    # (GIN-indexed by migration 0003); left empty on other backends
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     created_at = models.DateField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = MealQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at', '-updated_at']
+        indexes = [
+            # Partial index over MealQuerySet.available(); ignored on MySQL
+            models.Index(
+                fields=['-created_at', '-updated_at'], name='meal_available_idx',
+                condition=models.Q(is_active=True, is_approved=True, quantity_available__gt=0)
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} by {self.cook.user.username}"
     
+    def save(self, *args, **kwargs):
+        """Never write back rating totals or the search vector, which signal handlers may have moved since loading."""
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.RATING_TOTAL_FIELDS
+                and field.name != 'search_vector'
+            ]
+        super().save(*args, **kwargs)
+    
     @property
     def is_available(self):
         """Check if meal is available for ordering."""
@@ -56,25 +214,28 @@ class Meal(models.Model):
     
     @property
     def average_meal_rating(self):
-        """Calculate average rating for this specific meal."""
-        ratings = self.ratings.all()
-        if not ratings:
+        """Average rating for this specific meal."""
+        if not self.rating_count:
             return 0.0
-        total = sum(r.meal_rating for r in ratings)
-        return round(total / len(ratings), 1)
+        return round(self.rating_sum / self.rating_count, 1)
     
     @property
     def total_meal_ratings(self):
-        """Get total number of ratings for this meal."""
-        return self.ratings.count()
+        """Total number of ratings for this meal."""
+        return self.rating_count
+    
+    def unit_price(self, delivery_type):
+        """Price per portion for the given delivery type."""
+        if delivery_type == 'dine_in' and self.dine_with_us_available and self.dine_price:
+            return self.dine_price
+        return self.price
     
     def reduce_quantity(self, amount=1):
-        """Reduce available quantity after an order."""
-        if self.quantity_available >= amount:
-            self.quantity_available -= amount
-            # Auto mark as sold out if quantity reaches 0
-            if self.quantity_available == 0:
-                self.is_active = False
-            self.save()
-            return True
-        return False
+        """
+        Atomically take ``amount`` portions; returns False if fewer are left.
+        
+        See MealQuerySet.take_portions.
+        """
+        updated = Meal.objects.filter(pk=self.pk).take_portions({self.pk: amount})
+        self.refresh_from_db(fields=['quantity_available', 'is_active', 'updated_at'])
+        return bool(updated)
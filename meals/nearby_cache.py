@@ -0,0 +1,105 @@
+"""
+Tile-keyed cache of nearby-meal payloads.
+
+Customer locations are snapped to the centre of a small tile
+(TILE_DEGREES, ~550 m) and radii are rounded up to RADIUS_STEP_KM, so
+customers in the same office block or hostel share one cached
+MealListSerializer payload per (tile, radius bucket). Each payload reaches
+TILE_MARGIN_KM past its bucket, so it holds every kitchen within the bucket
+of any point in the tile; callers measure and trim from the customer's
+own location.
+
+Invalidation is by generation: tiles are grouped into blocks of
+BLOCK_DEGREES, each with a generation value stored in the cache. A payload
+key embeds the generations of every block its search circle overlaps, so
+a meal change only has to bump the generation of the one block containing
+the cook's kitchen to invalidate every payload that could list it.
+
+The cache alias is ``nearby`` (see NEARBY_CACHE_BACKEND in settings).
+"""
+import time
+from math import ceil, floor, sqrt
+
+from django.conf import settings
+from django.core.cache import caches
+
+from homebite.geo import KM_PER_DEGREE_LAT, bounding_box
+
+
+CACHE_ALIAS = 'nearby'
+
+TILE_DEGREES = 0.005
+BLOCK_DEGREES = 0.05
+RADIUS_STEP_KM = 0.5
+
+# Half the tile diagonal: the farthest a customer can be from their tile centre
+TILE_MARGIN_KM = TILE_DEGREES / 2 * KM_PER_DEGREE_LAT * sqrt(2)
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def tile_center(lat, lng):
+    """Snap a point to the centre of its tile."""
+    row = floor(float(lat) / TILE_DEGREES)
+    col = floor(float(lng) / TILE_DEGREES)
+    return (row + 0.5) * TILE_DEGREES, (col + 0.5) * TILE_DEGREES
+
+
+def radius_bucket(km):
+    """Round a search radius up to the next bucket, capped at MAX_SEARCH_RADIUS_KM."""
+    bucket = ceil(float(km) / RADIUS_STEP_KM) * RADIUS_STEP_KM
+    return min(max(bucket, RADIUS_STEP_KM), settings.MAX_SEARCH_RADIUS_KM)
+
+
+def _block(lat, lng):
+    return floor(float(lat) / BLOCK_DEGREES), floor(float(lng) / BLOCK_DEGREES)
+
+
+def _generation_key(block):
+    return f'nearby:gen:{block[0]}:{block[1]}'
+
+
+def _blocks_overlapping(lat, lng, km):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, km)
+    first_row, first_col = _block(min_lat, min_lng)
+    last_row, last_col = _block(max_lat, max_lng)
+    return [
+        (row, col)
+        for row in range(first_row, last_row + 1)
+        for col in range(first_col, last_col + 1)
+    ]
+
+
+def _payload_key(lat, lng, km):
+    keys = [_generation_key(block) for block in _blocks_overlapping(lat, lng, km)]
+    generations = _cache().get_many(keys)
+    stamp = '.'.join(str(generations.get(key, 0)) for key in keys)
+    return f'nearby:v2:{lat:.4f}:{lng:.4f}:{km:.3f}:{stamp}'
+
+
+def get_nearby_payload(lat, lng, km, compute):
+    """
+    Return the cached payload for the tile and radius bucket of (lat, lng, km).
+
+    On a miss, ``compute(tile_lat, tile_lng, radius_km)`` builds the payload,
+    which is stored for NEARBY_CACHE_TIMEOUT seconds. ``radius_km`` is the
+    radius bucket plus TILE_MARGIN_KM.
+    """
+    tile_lat, tile_lng = tile_center(lat, lng)
+    radius_km = radius_bucket(km) + TILE_MARGIN_KM
+    key = _payload_key(tile_lat, tile_lng, radius_km)
+
+    payload = _cache().get(key)
+    if payload is None:
+        payload = compute(tile_lat, tile_lng, radius_km)
+        _cache().set(key, payload)
+    return payload
+
+
+def invalidate_kitchen(lat, lng):
+    """Drop every cached payload that could include a kitchen at (lat, lng)."""
+    if lat is None or lng is None:
+        return
+    _cache().set(_generation_key(_block(lat, lng)), time.time_ns(), timeout=None)
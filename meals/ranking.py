@@ -0,0 +1,91 @@
+"""
+Weighted top-k ranking for meal feeds.
+
+Each candidate is scored on a blend of four signals, each normalised to
+0..1 (higher is better):
+
+    distance     1 - distance / max distance (0 when unknown)
+    cook_rating  cook rating / 5
+    meal_rating  average meal rating / 5
+    price        1 - price / highest candidate price
+
+The weights come from settings.MEAL_RANKING_WEIGHTS. Only the best
+``limit`` candidates are kept, using a bounded heap, so a feed of k items
+costs O(n log k) rather than a full sort.
+"""
+import heapq
+
+from django.conf import settings
+
+
+MAX_RATING = 5.0
+
+
+def _weights(weights=None):
+    weights = weights or settings.MEAL_RANKING_WEIGHTS
+    return (
+        float(weights.get('distance', 0)),
+        float(weights.get('cook_rating', 0)),
+        float(weights.get('meal_rating', 0)),
+        float(weights.get('price', 0)),
+    )
+
+
+def top_k(candidates, limit, features, max_distance_km=None, weights=None):
+    """
+    Return the ``limit`` best candidates, best first.
+
+    ``features(candidate)`` must return
+    ``(distance_km, cook_rating, meal_rating, price)``; distance may be None.
+    Ties keep the candidates' incoming order.
+    """
+    candidates = list(candidates)
+    if not candidates or limit <= 0:
+        return []
+
+    rows = [
+        (index, candidate, *(None if value is None else float(value) for value in features(candidate)))
+        for index, candidate in enumerate(candidates)
+    ]
+    max_price = max((row[5] for row in rows if row[5] is not None), default=0.0)
+    if max_distance_km is None:
+        max_distance_km = max((row[2] for row in rows if row[2] is not None), default=0.0)
+    max_distance_km = float(max_distance_km)
+    w_distance, w_cook, w_meal, w_price = _weights(weights)
+
+    def score(row):
+        _, _, distance, cook_rating, meal_rating, price = row
+        total = 0.0
+        if distance is not None and max_distance_km > 0:
+            total += w_distance * max(0.0, 1.0 - distance / max_distance_km)
+        total += w_cook * (cook_rating or 0.0) / MAX_RATING
+        total += w_meal * (meal_rating or 0.0) / MAX_RATING
+        if price is not None and max_price > 0:
+            total += w_price * (1.0 - price / max_price)
+        return total
+
+    best = heapq.nsmallest(limit, rows, key=lambda row: (-score(row), row[0]))
+    return [row[1] for row in best]
+
+
+def meal_features(distances=None):
+    """Feature extractor for Meal objects; ``distances`` maps cook id to km."""
+    distances = distances or {}
+
+    def features(meal):
+        distance = getattr(meal, 'distance_km', None)
+        if distance is None:
+            distance = distances.get(meal.cook_id)
+        return distance, meal.cook.rating, meal.average_meal_rating, meal.price
+
+    return features
+
+
+def payload_features(item):
+    """Feature extractor for serialized MealListSerializer items."""
+    return (
+        item.get('distance_km'),
+        item.get('cook_rating'),
+        item.get('average_meal_rating'),
+        item.get('price'),
+    )
@@ -0,0 +1,142 @@
+"""
+Full-text search over meal name, description and cook username.
+
+PostgreSQL keeps a weighted ``Meal.search_vector`` document with a GIN
+index and queries it with SearchQuery/SearchRank; SQLite keeps an FTS5
+table keyed by meal id. Both are created by migration
+0003_meal_search_index and refreshed from the Meal/User signal handlers
+in meals.signals. Any other backend falls back to ``icontains`` matching.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, OuterRef, Q, Subquery
+
+from accounts.models import CookProfile
+from .models import Meal
+
+
+FTS_TABLE = 'meals_meal_fts'
+
+# Relative weights of name, description and cook username
+SQLITE_BM25_WEIGHTS = (10.0, 2.0, 5.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+_fts_databases = set()
+
+
+def _search_backend(using):
+    """Return 'postgresql', 'sqlite' or None when no full-text index is available."""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor == 'sqlite':
+        database = connection.settings_dict['NAME']
+        if database not in _fts_databases:
+            if FTS_TABLE not in connection.introspection.table_names():
+                return None
+            _fts_databases.add(database)
+        return 'sqlite'
+    return None
+
+
+def index_meals(meal_ids=None, using='default'):
+    """
+    Refresh the search index for the given meal ids (all meals if None).
+    """
+    backend = _search_backend(using)
+    if backend is None:
+        return
+    if meal_ids is not None:
+        meal_ids = list(meal_ids)
+        if not meal_ids:
+            return
+
+    if backend == 'postgresql':
+        meals = Meal.objects.using(using)
+        if meal_ids is not None:
+            meals = meals.filter(id__in=meal_ids)
+        cook_username = CookProfile.objects.filter(pk=OuterRef('cook_id')).values('user__username')[:1]
+        meals.update(search_vector=(
+            SearchVector('name', weight='A', config='simple') +
+            SearchVector(Subquery(cook_username), weight='B', config='simple') +
+            SearchVector('description', weight='C', config='simple')
+        ))
+        return
+
+    if meal_ids is not None:
+        id_filter = f"meals_meal.id IN ({', '.join(['%s'] * len(meal_ids))})"
+        params = meal_ids
+    else:
+        id_filter = '1 = 1'
+        params = []
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE {id_filter.replace('meals_meal.id', 'rowid')}",
+            params
+        )
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, name, description, cook_username) '
+            'SELECT meals_meal.id, meals_meal.name, meals_meal.description, accounts_user.username '
+            'FROM meals_meal '
+            'JOIN accounts_cookprofile ON accounts_cookprofile.id = meals_meal.cook_id '
+            'JOIN accounts_user ON accounts_user.id = accounts_cookprofile.user_id '
+            f'WHERE {id_filter}',
+            params
+        )
+
+
+def remove_meals(meal_ids, using='default'):
+    """Drop deleted meals from the SQLite index (PostgreSQL rows go with the meal)."""
+    meal_ids = list(meal_ids)
+    if not meal_ids or _search_backend(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(meal_ids))})",
+            meal_ids
+        )
+
+
+def search_meals(queryset, query):
+    """
+    Filter a Meal queryset to full-text matches of ``query``.
+
+    Every word must match, as a prefix, the meal name, description or cook
+    username. Matches are annotated with ``search_rank`` (lower is more
+    relevant) and ordered by it; callers may re-order afterwards.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return queryset
+
+    backend = _search_backend(queryset.db)
+    if backend == 'postgresql':
+        search_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens), search_type='raw', config='simple'
+        )
+        return queryset.filter(search_vector=search_query).annotate(
+            search_rank=-SearchRank(F('search_vector'), search_query)
+        ).order_by('search_rank', '-id')
+
+    if backend == 'sqlite':
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        return queryset.extra(
+            select={'search_rank': f'bm25({FTS_TABLE}, {weights})'},
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = meals_meal.id', f'{FTS_TABLE} MATCH %s'],
+            params=[match],
+        ).order_by('search_rank', '-id')
+
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(name__icontains=token) |
+            Q(description__icontains=token) |
+            Q(cook__user__username__icontains=token)
+        )
+    return queryset.filter(condition)
@@ -0,0 +1,131 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from accounts.models import CookProfile, User
+from . import nearby_cache, search
+from .suggest import suggest_index
+from .models import Meal
+
+
+SEARCH_FIELDS = {'name', 'description', 'cook'}
+
+
+@receiver(post_save, sender=Meal)
+def index_meal(sender, instance, using, update_fields=None, **kwargs):
+    """Refresh the meal's full-text index entry."""
+    if update_fields is not None and not SEARCH_FIELDS.intersection(update_fields):
+        return
+    search.index_meals([instance.pk], using=using)
+
+
+@receiver(post_delete, sender=Meal)
+def unindex_meal(sender, instance, using, **kwargs):
+    search.remove_meals([instance.pk], using=using)
+
+
+@receiver(post_save, sender=User)
+def reindex_cook_meals(sender, instance, using, update_fields=None, **kwargs):
+    """Cook usernames are searchable, so re-index a cook's meals once the change commits."""
+    if instance.role != 'cook':
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    transaction.on_commit(partial(_reindex_cook_meals, instance.pk, using), using=using)
+
+
+def _reindex_cook_meals(user_id, using):
+    meal_ids = Meal.objects.using(using).filter(cook__user_id=user_id).values_list('id', flat=True)
+    search.index_meals(meal_ids, using=using)
+
+
+# Nearby-meal cache invalidation (see meals.nearby_cache)
+
+def _invalidate_cook_kitchen(cook_profile):
+    nearby_cache.invalidate_kitchen(
+        cook_profile.kitchen_location_lat, cook_profile.kitchen_location_lng
+    )
+
+
+@receiver(post_save, sender=Meal)
+@receiver(post_delete, sender=Meal)
+def invalidate_nearby_for_meal(sender, instance, **kwargs):
+    _invalidate_cook_kitchen(instance.cook)
+
+
+@receiver(pre_save, sender=CookProfile)
+def invalidate_nearby_for_old_kitchen(sender, instance, raw=False, **kwargs):
+    """A kitchen that moves disappears from the payloads around its old spot."""
+    if raw or instance.pk is None:
+        return
+    previous = CookProfile.objects.filter(pk=instance.pk).values_list(
+        'kitchen_location_lat', 'kitchen_location_lng'
+    ).first()
+    if previous:
+        nearby_cache.invalidate_kitchen(*previous)
+
+
+@receiver(post_save, sender=CookProfile)
+@receiver(post_delete, sender=CookProfile)
+def invalidate_nearby_for_kitchen(sender, instance, **kwargs):
+    _invalidate_cook_kitchen(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_nearby_for_cook(sender, instance, using=None, update_fields=None, **kwargs):
+    """Approval, activation and username changes all show up in nearby payloads."""
+    if instance.role != 'cook':
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(partial(_invalidate_kitchen_of_user, instance.pk, using), using=using)
+
+
+def _invalidate_kitchen_of_user(user_id, using):
+    cook_profile = CookProfile.objects.using(using).filter(user_id=user_id).first()
+    if cook_profile is not None:
+        _invalidate_cook_kitchen(cook_profile)
+
+
+# Meal payloads embed cook details, so cook changes count as meal changes
+# for the catalogue validators in meals.api_views
+
+@receiver(post_save, sender=CookProfile)
+def touch_meals_for_kitchen(sender, instance, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    Meal.objects.using(using).filter(cook=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_meals_for_cook(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    if raw or instance.role != 'cook':
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    transaction.on_commit(partial(_touch_meals_of_user, instance.pk, using), using=using)
+
+
+def _touch_meals_of_user(user_id, using):
+    Meal.objects.using(using).filter(cook__user_id=user_id).update(updated_at=timezone.now())
+
+
+# Typeahead index invalidation (see meals.suggest)
+
+@receiver(post_save, sender=Meal)
+@receiver(post_delete, sender=Meal)
+def invalidate_suggestions_for_meal(sender, instance, **kwargs):
+    suggest_index.invalidate()
+
+
+@receiver(post_save, sender=User)
+def invalidate_suggestions_for_cook(sender, instance, using=None, update_fields=None, **kwargs):
+    if instance.role != 'cook':
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    # Dropped after commit so a concurrent lookup cannot rebuild from the old rows
+    transaction.on_commit(suggest_index.invalidate, using=using)
@@ -0,0 +1,84 @@
+"""
+In-memory typeahead index over meal names and cook usernames.
+
+Each worker keeps a sorted array of lowercased search keys; a lookup is a
+``bisect`` to the first key with the typed prefix followed by a short
+forward scan. Every word of a meal name is a key of its own, so "bir"
+suggests "Chicken Biryani". The index only covers currently available
+meals and their cooks. It is built lazily, dropped by the Meal/User
+signal handlers in meals.signals, and rebuilt after
+SUGGEST_INDEX_TTL_SECONDS so changes made in other workers show up too.
+"""
+import bisect
+import threading
+import time
+
+from django.conf import settings
+
+
+class SuggestIndex:
+    """Process-wide, lazily rebuilt prefix index of meal and cook names."""
+
+    def __init__(self):
+        self._index = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the index; the next lookup rebuilds it."""
+        self._index = None
+
+    def _load(self):
+        from .models import Meal
+
+        entries = set()
+        rows = Meal.objects.available().values_list('id', 'name', 'cook_id', 'cook__user__username')
+        for meal_id, name, cook_id, username in rows:
+            words = name.lower().split()
+            for position in range(len(words)):
+                entries.add((' '.join(words[position:]), position, 'meal', name, meal_id))
+            entries.add((username.lower(), 0, 'cook', username, cook_id))
+
+        # Among equal keys, whole-name matches sort ahead of later-word matches
+        entries = sorted(entries, key=lambda entry: (entry[0], entry[1], entry[3], entry[4]))
+        keys = [entry[0] for entry in entries]
+        suggestions = [
+            {'text': text, 'type': kind, 'id': object_id}
+            for _, _, kind, text, object_id in entries
+        ]
+        return keys, suggestions
+
+    def _get_index(self):
+        ttl = getattr(settings, 'SUGGEST_INDEX_TTL_SECONDS', 300)
+        index = self._index
+        if index is None or time.monotonic() - self._built_at > ttl:
+            with self._lock:
+                if self._index is None or time.monotonic() - self._built_at > ttl:
+                    self._index = self._load()
+                    self._built_at = time.monotonic()
+                index = self._index
+        return index
+
+    def suggest(self, prefix, limit=10):
+        """Return up to ``limit`` distinct suggestions starting with ``prefix``."""
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix or limit <= 0:
+            return []
+
+        keys, suggestions = self._get_index()
+        results = []
+        seen = set()
+        position = bisect.bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            suggestion = suggestions[position]
+            identity = (suggestion['type'], suggestion['id'])
+            if identity not in seen:
+                seen.add(identity)
+                results.append(suggestion)
+                if len(results) == limit:
+                    break
+            position += 1
+        return results
+
+
+suggest_index = SuggestIndex()
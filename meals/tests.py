@@ -1,3 +1,59 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import Client, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from homebite.testing import create_cook, create_customer, create_meal
+
+
+class MealAdminActionTests(TestCase):
+    """Bulk admin actions must invalidate what the Meal signals would have."""
+
+    def setUp(self):
+        cook = create_cook(kitchen_location_lat=Decimal('31.52'), kitchen_location_lng=Decimal('74.35'))
+        self.meal = create_meal(cook, 'Nihari', price=300, is_approved=False)
+        admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client = Client(SERVER_NAME='localhost')
+        self.client.force_login(admin_user)
+
+    def test_approve_bumps_updated_at_and_invalidates_caches(self):
+        updated_at = self.meal.updated_at
+        with mock.patch('meals.nearby_cache.invalidate_kitchen') as invalidate_kitchen, \
+                mock.patch('meals.models.suggest_index.invalidate') as invalidate_suggestions, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin:meals_meal_changelist'), {
+                'action': 'approve_meals', '_selected_action': [self.meal.pk],
+            })
+        self.assertEqual(response.status_code, 302)
+
+        self.meal.refresh_from_db()
+        self.assertTrue(self.meal.is_approved)
+        self.assertGreater(self.meal.updated_at, updated_at)
+        invalidate_kitchen.assert_called_with(Decimal('31.520000'), Decimal('74.350000'))
+        invalidate_suggestions.assert_called()
+
+
+class BrowseConditionalGetTests(TestCase):
+    """Browse validators must cover the meals the facets count, not just the page."""
+
+    def setUp(self):
+        cook = create_cook()
+        create_meal(cook, 'Daal', price=150)
+        self.expensive = create_meal(cook, 'Karahi', price=900)
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(create_customer().user)
+
+    def test_change_outside_the_price_filter_revalidates(self):
+        first = self.client.get('/api/meals/browse/', {'max_price': 200})
+        self.assertEqual(first.status_code, 200)
+
+        self.expensive.price = 1500
+        self.expensive.save()
+        second = self.client.get(
+            '/api/meals/browse/', {'max_price': 200}, HTTP_IF_NONE_MATCH=first['ETag']
+        )
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second.data['facets']['price'], first.data['facets']['price'])
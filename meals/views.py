@@ -3,44 +3,13 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.db.models import Q
 from django.conf import settings
-import math
 from .models import Meal
 from .forms import MealForm, MealFilterForm
+from .search import search_meals
+from . import ranking
 from accounts.models import CookProfile, CustomerProfile
-
-
-def haversine_distance(lat1, lon1, lat2, lon2):
-    """
-    Calculate the great circle distance between two points 
-    on the earth (specified in decimal degrees) using Haversine formula.
-    Returns distance in kilometers, or None if invalid coordinates.
-    """
-    try:
-        # Validate and convert to float
-        lat1 = float(lat1) if lat1 is not None else None
-        lon1 = float(lon1) if lon1 is not None else None
-        lat2 = float(lat2) if lat2 is not None else None
-        lon2 = float(lon2) if lon2 is not None else None
-        
-        # Check for None values
-        if None in (lat1, lon1, lat2, lon2):
-            return None
-        
-        # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Radius of earth in kilometers
-        r = 6371
-        
-        return c * r
-    except (ValueError, TypeError):
-        return None
+from accounts.kitchen_index import kitchen_index
+from homebite.geo import distance_km
 
 
 def browse_meals(request):
@@ -54,8 +23,8 @@ def browse_meals(request):
     
     if request.user.is_authenticated and hasattr(request.user, 'customer_profile'):
         profile = request.user.customer_profile
-        customer_lat = profile.office_location_lat
-        customer_lng = profile.office_location_lng
+        customer_lat = profile.location_lat
+        customer_lng = profile.location_lng
     
     # Override with query params if provided
     if request.GET.get('lat') and request.GET.get('lng'):
@@ -66,22 +35,12 @@ def browse_meals(request):
             pass
     
     # Get all available meals
-    meals = Meal.objects.filter(
-        is_active=True,
-        is_approved=True,
-        quantity_available__gt=0,
-        cook__user__is_approved=True,
-        cook__user__is_active=True
-    ).select_related('cook', 'cook__user')
+    meals = Meal.objects.available().select_related('cook', 'cook__user')
     
     # Apply search filter
     search_query = request.GET.get('search', '').strip()
     if search_query:
-        meals = meals.filter(
-            Q(name__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(cook__user__username__icontains=search_query)
-        )
+        meals = search_meals(meals, search_query)
     
     # Apply price filter
     max_price = request.GET.get('max_price')
@@ -97,35 +56,40 @@ def browse_meals(request):
         max_distance = float(request.GET.get('max_distance', settings.DEFAULT_SEARCH_RADIUS_KM))
     except (ValueError, TypeError):
         max_distance = settings.DEFAULT_SEARCH_RADIUS_KM
+    max_distance = min(max_distance, settings.MAX_SEARCH_RADIUS_KM)
+    
+    cook_distances = {}
+    if customer_lat and customer_lng:
+        # Kitchens in range come from the in-memory kitchen index; kitchens
+        # without a location are still listed without a distance
+        cook_distances = kitchen_index.cooks_within(customer_lat, customer_lng, max_distance)
+        meals = meals.filter(
+            Q(cook_id__in=cook_distances) |
+            Q(cook__kitchen_location_lat__isnull=True) |
+            Q(cook__kitchen_location_lng__isnull=True)
+        )
     
     for meal in meals:
-        if customer_lat and customer_lng and meal.cook.kitchen_location_lat and meal.cook.kitchen_location_lng:
-            distance = haversine_distance(
-                customer_lat, customer_lng,
-                meal.cook.kitchen_location_lat, meal.cook.kitchen_location_lng
-            )
-            if distance is not None and distance <= max_distance:
-                meals_with_distance.append({
-                    'meal': meal,
-                    'distance': round(distance, 2)
-                })
-            elif distance is None:
-                # Invalid coordinates, include without distance
-                meals_with_distance.append({
-                    'meal': meal,
-                    'distance': None
-                })
-        else:
-            # If no location data, include with None distance
-            meals_with_distance.append({
-                'meal': meal,
-                'distance': None
-            })
-    
-    # Apply sorting
-    sort_by = request.GET.get('sort_by', 'distance')
-    
-    if sort_by == 'distance':
+        distance = cook_distances.get(meal.cook_id)
+        meals_with_distance.append({
+            'meal': meal,
+            'distance': round(distance, 2) if distance is not None else None
+        })
+    
+    # Apply sorting (searches keep their text-match order unless asked otherwise)
+    sort_by = request.GET.get('sort_by', 'match' if search_query else 'distance')
+    
+    if sort_by == 'relevance':
+        try:
+            limit = int(request.GET.get('limit', len(meals_with_distance)))
+        except (ValueError, TypeError):
+            limit = len(meals_with_distance)
+        meals_with_distance = ranking.top_k(
+            meals_with_distance, limit,
+            lambda x: (x['distance'], x['meal'].cook.rating, x['meal'].average_meal_rating, x['meal'].price),
+            max_distance_km=max_distance
+        )
+    elif sort_by == 'distance':
         meals_with_distance.sort(key=lambda x: (x['distance'] is None, x['distance'] or 0))
     elif sort_by == 'price_low':
         meals_with_distance.sort(key=lambda x: x['meal'].price)
@@ -154,13 +118,12 @@ def meal_detail(request, pk):
     distance = None
     if request.user.is_authenticated and hasattr(request.user, 'customer_profile'):
         profile = request.user.customer_profile
-        if profile.office_location_lat and profile.office_location_lng:
-            if meal.cook.kitchen_location_lat and meal.cook.kitchen_location_lng:
-                distance = haversine_distance(
-                    profile.office_location_lat, profile.office_location_lng,
-                    meal.cook.kitchen_location_lat, meal.cook.kitchen_location_lng
-                )
-                distance = round(distance, 2)
+        distance = distance_km(
+            profile.location_lat, profile.location_lng,
+            meal.cook.kitchen_location_lat, meal.cook.kitchen_location_lng
+        )
+        if distance is not None:
+            distance = round(distance, 2)
     
     context = {
         'meal': meal,
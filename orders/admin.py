@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Order
+from .models import IdempotencyKey, Order, OutboxEvent
 
 
 @admin.register(Order)
@@ -39,27 +39,43 @@ class OrderAdmin(admin.ModelAdmin):
     
     actions = ['mark_confirmed', 'mark_ready', 'mark_completed', 'mark_cancelled']
     
+    # Each action is a constant number of queries however many orders are
+    # selected (see OrderQuerySet.transition)
+    
     @admin.action(description='Mark selected orders as confirmed')
     def mark_confirmed(self, request, queryset):
-        updated = queryset.filter(status='pending').update(status='confirmed')
+        updated = len(queryset.transition('confirmed'))
         self.message_user(request, f'{updated} order(s) confirmed.')
     
     @admin.action(description='Mark selected orders as ready')
     def mark_ready(self, request, queryset):
-        updated = queryset.filter(status__in=['pending', 'confirmed']).update(status='ready')
+        updated = len(queryset.transition('ready'))
         self.message_user(request, f'{updated} order(s) marked as ready.')
     
     @admin.action(description='Mark selected orders as completed')
     def mark_completed(self, request, queryset):
-        for order in queryset.filter(status='ready'):
-            order.mark_as_completed()
-        self.message_user(request, 'Orders marked as completed.')
+        updated = len(queryset.filter(status='ready').complete())
+        self.message_user(request, f'{updated} order(s) marked as completed.')
     
     @admin.action(description='Cancel selected orders')
     def mark_cancelled(self, request, queryset):
-        count = 0
-        for order in queryset.filter(status__in=['pending', 'confirmed']):
-            if order.cancel():
-                count += 1
+        count = len(queryset.cancel())
         self.message_user(request, f'{count} order(s) cancelled.')
 
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    """Read-only view of stored Idempotency-Key responses."""
+    
+    list_display = ['key', 'user', 'response_status', 'created_at']
+    search_fields = ['key', 'user__username']
+    readonly_fields = ['user', 'key', 'request_fingerprint', 'response_status', 'response_body', 'created_at']
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Read-only view of queued order side effects."""
+    
+    list_display = ['id', 'topic', 'created_at', 'processed_at', 'attempts']
+    list_filter = ['topic', 'processed_at']
+    readonly_fields = ['topic', 'payload', 'created_at', 'processed_at', 'attempts', 'last_error']
@@ -1,31 +1,54 @@
+from collections import defaultdict
+
+from django.db import transaction
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from homebite.pagination import KeysetPaginationMixin
+from homebite.streaming import StreamingListMixin
+from .events import orders_created, publish_orders_created
+from .idempotency import idempotent
 from .models import Order
-from .serializers import OrderSerializer, OrderCreateSerializer
+from .serializers import (
+    BulkStatusSerializer, CheckoutSerializer, OrderSerializer, OrderCreateSerializer, OrderListSerializer
+)
+from meals.models import Meal
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(KeysetPaginationMixin, StreamingListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = OrderSerializer
+    # Actions returning many orders, served with the flat OrderListSerializer
+    list_actions = ('list', 'history', 'active', 'completed')
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'cook' and hasattr(user, 'cook_profile'):
             # Cooks see orders for their meals
-            return Order.objects.filter(cook=user.cook_profile).select_related('customer', 'meal', 'cook')
+            orders = Order.objects.filter(cook=user.cook_profile)
         elif user.role == 'customer' and hasattr(user, 'customer_profile'):
             # Customers see their own orders
-            return Order.objects.filter(customer=user.customer_profile).select_related('meal', 'cook')
-        # Return empty queryset for users without profiles
-        return Order.objects.none()
+            orders = Order.objects.filter(customer=user.customer_profile)
+        else:
+            # Return empty queryset for users without profiles
+            return Order.objects.none()
+        if self.action in self.list_actions:
+            # Everything OrderListSerializer reads comes from this one query
+            return orders.select_related('meal', 'cook__user', 'customer__user')
+        return orders.select_related('customer', 'meal', 'cook')
 
     def get_serializer_class(self):
         if self.action == 'create':
             return OrderCreateSerializer
+        if self.action in self.list_actions:
+            return OrderListSerializer
         return OrderSerializer
 
+    def create(self, request, *args, **kwargs):
+        """Create an order; retries carrying the same Idempotency-Key replay the first response."""
+        return idempotent(request, lambda: super(OrderViewSet, self).create(request, *args, **kwargs))
+    
     def perform_create(self, serializer):
         """Create order with inventory validation."""
         meal = serializer.validated_data['meal']
@@ -37,35 +60,102 @@ class OrderViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'meal': 'This meal is not available for ordering.'})
         
-        # For non-dine-in orders, validate quantity
-        if delivery_type != 'dine_in':
-            if quantity > meal.quantity_available:
+        # Calculate price based on delivery type
+        total_price = meal.unit_price(delivery_type) * quantity
+        
+        with transaction.atomic():
+            # For non-dine-in orders, take the portions first: the conditional
+            # decrement fails instead of overselling when stock runs out
+            if delivery_type != 'dine_in' and not meal.reduce_quantity(quantity):
                 from rest_framework.exceptions import ValidationError
                 raise ValidationError({
                     'quantity': f'Only {meal.quantity_available} portions available. You requested {quantity}.'
                 })
+            
+            # Create order with total_price
+            serializer.save(total_price=total_price)
+
+    @action(detail=False, methods=['post'])
+    def checkout(self, request):
+        """Place every item of a cart as orders in a single transaction."""
+        return idempotent(request, lambda: self._checkout(request))
+    
+    def _checkout(self, request):
+        if request.user.role != 'customer' or not hasattr(request.user, 'customer_profile'):
+            return Response({'error': 'Only customers can place orders'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Calculate price based on delivery type
-        if delivery_type == 'dine_in' and meal.dine_with_us_available:
-            price_per_unit = meal.dine_price if meal.dine_price else meal.price
-        else:
-            price_per_unit = meal.price
+        serializer = CheckoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['items']
+        customer = request.user.customer_profile
+        
+        # Portions needed per meal (dine-in orders do not use stock)
+        portions = defaultdict(int)
+        for item in items:
+            if item['delivery_type'] != 'dine_in':
+                portions[item['meal']] += item['quantity']
         
-        total_price = price_per_unit * quantity
+        with transaction.atomic():
+            # Lock the meals in id order so concurrent checkouts cannot deadlock
+            meals = Meal.objects.available().select_related('cook', 'cook__user').select_for_update(
+                of=('self',)
+            ).filter(pk__in={item['meal'] for item in items}).order_by('pk').in_bulk()
+            
+            errors = []
+            for item in items:
+                meal = meals.get(item['meal'])
+                if meal is None:
+                    errors.append({'meal': 'This meal is not available for ordering.'})
+                elif portions.get(meal.pk, 0) > meal.quantity_available:
+                    errors.append({
+                        'quantity': f'Only {meal.quantity_available} portions available. '
+                                    f'Your cart requests {portions[meal.pk]}.'
+                    })
+                else:
+                    errors.append({})
+            if any(errors):
+                from rest_framework.exceptions import ValidationError
+                raise ValidationError({'items': errors})
+            
+            if Meal.objects.take_portions(portions) != len(portions):
+                from rest_framework.exceptions import ValidationError
+                raise ValidationError({'items': 'Some meals sold out while checking out. Please try again.'})
+            
+            orders = Order.objects.bulk_create([
+                Order(
+                    customer=customer,
+                    meal=meals[item['meal']],
+                    cook=meals[item['meal']].cook,
+                    quantity=item['quantity'],
+                    total_price=meals[item['meal']].unit_price(item['delivery_type']) * item['quantity'],
+                    delivery_type=item['delivery_type'],
+                    payment_method=serializer.validated_data['payment_method'],
+                    customer_phone=request.user.phone,
+                    notes=item['notes'],
+                    status='pending'
+                )
+                for item in items
+            ])
+            # bulk_create skips post_save, so the dashboard events go out here
+            publish_orders_created(orders)
+            orders_created.send(sender=Order, orders=orders)
         
-        # Create order with total_price
-        order = serializer.save(total_price=total_price)
+        # Serialize with the stock left after checkout
+        for meal_id, remaining in Meal.objects.filter(pk__in=portions).values_list('pk', 'quantity_available'):
+            meals[meal_id].quantity_available = remaining
         
-        # Reduce meal quantity (only for pickup/delivery, not dine-in)
-        if delivery_type != 'dine_in':
-            meal.reduce_quantity(quantity)
-
+        return Response({
+            'orders': OrderSerializer(orders, many=True, context=self.get_serializer_context()).data,
+            'total_price': str(sum(order.total_price for order in orders)),
+        }, status=status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'])
     def history(self, request):
         """Get order history for current user"""
-        orders = self.get_queryset().order_by('-created_at')
-        serializer = self.get_serializer(orders, many=True)
-        return Response(serializer.data)
+        orders = self.get_queryset().order_by('-created_at', '-id')
+        if self.stream_requested():
+            return self.streaming_response(orders)
+        return self.paginated_response(orders)
 
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
@@ -109,21 +199,49 @@ class OrderViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
     
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_status(self, request):
+        """Move many of the cook's orders to one status at once."""
+        if not hasattr(request.user, 'cook_profile'):
+            return Response(
+                {'error': 'Only the cook can update order status'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order_ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        new_status = serializer.validated_data['status']
+        
+        orders = Order.objects.filter(cook=request.user.cook_profile, pk__in=order_ids)
+        updated = set(orders.transition(new_status))
+        current = dict(orders.values_list('pk', 'status'))
+        
+        results = []
+        for order_id in order_ids:
+            if order_id in updated:
+                result = 'updated'
+            elif order_id not in current:
+                result = 'not_found'
+            else:
+                result = 'invalid_transition'
+            results.append({'id': order_id, 'result': result, 'status': current.get(order_id)})
+        
+        return Response({'status': new_status, 'updated': len(updated), 'results': results})
+    
     @action(detail=False, methods=['get'])
     def active(self, request):
         """Get active orders (pending only) for current user."""
         orders = self.get_queryset().filter(
             status='pending'
         ).order_by('-created_at')
-        serializer = self.get_serializer(orders, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(orders)
     
     @action(detail=False, methods=['get'])
     def completed(self, request):
         """Get completed orders for current user."""
         orders = self.get_queryset().filter(status='completed').order_by('-created_at')
-        serializer = self.get_serializer(orders, many=True)
-        return Response(serializer.data)
+        return self.paginated_response(orders)
     
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
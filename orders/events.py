@@ -0,0 +1,58 @@
+"""
+Order events for the cook dashboard stream (see homebite.events).
+
+Events are published once the surrounding transaction commits, on the
+``cook:<id>:orders`` channel of the order's cook:
+
+    order.created         the full OrderSerializer payload
+    order.status_changed  {"id", "status", "updated_at"}
+
+The ``orders_created`` and ``orders_status_changed`` signals stand in for
+post_save where orders are written set-wise (checkout's bulk_create and
+OrderQuerySet.transition), for receivers that must see every order.
+"""
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from homebite.events import broker
+
+
+# Sent with ``orders``: the Order instances created by bulk_create
+orders_created = Signal()
+
+# Sent with ``orders``: dicts of the changed orders' fields before the
+# change (pk, cook_id, delivery_type, status, total_price, created_at, ...),
+# and ``new_status``
+orders_status_changed = Signal()
+
+
+def cook_channel(cook_id):
+    return f'cook:{cook_id}:orders'
+
+
+def publish_orders_created(orders):
+    """Publish ``order.created`` for each order after commit."""
+    def publish():
+        from .serializers import OrderSerializer
+
+        for order in orders:
+            channel = cook_channel(order.cook_id)
+            if broker.subscriber_count(channel):
+                broker.publish(channel, 'order.created', OrderSerializer(order).data)
+
+    transaction.on_commit(publish)
+
+
+def publish_status_changed(changes, new_status, updated_at=None):
+    """Publish ``order.status_changed`` for each ``(order_id, cook_id)`` after commit."""
+    updated_at = (updated_at or timezone.now()).isoformat()
+
+    def publish():
+        for order_id, cook_id in changes:
+            broker.publish(
+                cook_channel(cook_id), 'order.status_changed',
+                {'id': order_id, 'status': new_status, 'updated_at': updated_at}
+            )
+
+    transaction.on_commit(publish)
@@ -0,0 +1,88 @@
+"""
+Idempotency-Key support for order-creating endpoints.
+
+The key row is inserted, the handler run and its response stored in one
+transaction, so an order is never committed without the response that
+replays it. Retries with the same key and body get the stored response
+back without touching Meal or Order, and reusing a key for a different
+request gets 422. A concurrent retry blocks on the key's unique constraint
+until the first request finishes, then replays its response. Failed
+requests roll the key back with everything else, so the client can try
+again. Keys stop replaying after IDEMPOTENCY_KEY_TTL_HOURS; the
+purge_idempotency_keys command deletes them.
+"""
+import hashlib
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256()
+    digest.update(request.method.encode('utf-8'))
+    digest.update(request.path.encode('utf-8'))
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(record, fingerprint):
+    if record.request_fingerprint != fingerprint:
+        return Response(
+            {'error': f'{HEADER} was already used for a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    response = Response(record.response_body, status=record.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent(request, handler):
+    """
+    Run ``handler()`` at most once per (user, Idempotency-Key).
+
+    Requests without the header are passed straight through.
+    """
+    key = request.headers.get(HEADER)
+    if not key:
+        return handler()
+    if len(key) > MAX_KEY_LENGTH:
+        return Response(
+            {'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Read the body before DRF parses it; it cannot be read afterwards
+    fingerprint = _fingerprint(request)
+    record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+    if record is not None:
+        # Rows without a response predate keys being stored atomically
+        if not record.is_expired and record.response_status is not None:
+            return _replay(record, fingerprint)
+        record.delete()
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                record = IdempotencyKey.objects.create(
+                    user=request.user, key=key, request_fingerprint=fingerprint
+                )
+        except IntegrityError:
+            # A concurrent request with the same key committed first
+            return _replay(IdempotencyKey.objects.get(user=request.user, key=key), fingerprint)
+
+        response = handler()
+        if not status.is_success(response.status_code):
+            transaction.set_rollback(True)
+            return response
+
+        record.response_status = response.status_code
+        record.response_body = response.data
+        record.save(update_fields=['response_status', 'response_body'])
+    return response
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from orders.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Apply pending order side effects (cook credits, meal restocks) from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Events claimed per batch')
+        parser.add_argument('--workers', type=int, default=4, help='Threads applying events in parallel')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds to sleep between polls with --loop')
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            processed, failed = process_batch(
+                batch_size=options['batch_size'], workers=options['workers']
+            )
+            total += processed
+            if failed:
+                self.stdout.write(self.style.WARNING(f'⚠️ {failed} outbox event(s) failed and will be retried'))
+            if processed:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Processed {total} outbox event(s)'))
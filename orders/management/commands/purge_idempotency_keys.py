@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from orders.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete Idempotency-Key records older than IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyKey.objects.expired().delete()
+        self.stdout.write(self.style.SUCCESS(f'✅ Purged {deleted} expired idempotency key(s)'))
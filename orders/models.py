@@ -1,7 +1,71 @@
-from django.db import models
+from collections import Counter
+from datetime import timedelta
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.utils import timezone
 from accounts.models import CustomerProfile, CookProfile
 from meals.models import Meal
+from .events import orders_status_changed, publish_status_changed
+
+
+class OrderQuerySet(models.QuerySet):
+    
+    def transition(self, new_status):
+        """
+        Move every order here that may go to ``new_status`` there, set-wise.
+        
+        Orders are filtered by Order.ALLOWED_TRANSITIONS and changed with one
+        UPDATE. Completing orders credits each cook's ``total_orders`` and
+        cancelling them returns their portions to stock; both are recorded
+        as one OutboxEvent in the same transaction and applied by the
+        outbox worker, so the query count does not grow with the number of
+        orders. Returns the ids of the orders that changed.
+        """
+        allowed = Order.ALLOWED_TRANSITIONS[new_status]
+        with transaction.atomic(using=self.db):
+            rows = list(
+                self.filter(status__in=allowed).select_for_update().order_by('pk').values(
+                    'pk', 'cook_id', 'meal_id', 'quantity', 'delivery_type',
+                    'status', 'total_price', 'created_at'
+                )
+            )
+            if not rows:
+                return []
+            order_ids = [row['pk'] for row in rows]
+            updated_at = timezone.now()
+            Order.objects.using(self.db).filter(pk__in=order_ids).update(
+                status=new_status, updated_at=updated_at
+            )
+            publish_status_changed(
+                [(row['pk'], row['cook_id']) for row in rows], new_status, updated_at
+            )
+            orders_status_changed.send(sender=Order, orders=rows, new_status=new_status, using=self.db)
+            
+            # Follow-up work runs in the outbox worker (see orders.outbox)
+            if new_status == 'completed':
+                completed = Counter(row['cook_id'] for row in rows)
+                OutboxEvent.objects.using(self.db).create(
+                    topic='order.completed', payload={'cooks': completed}
+                )
+            elif new_status == 'cancelled':
+                portions = Counter()
+                for row in rows:
+                    if row['delivery_type'] != 'dine_in':
+                        portions[row['meal_id']] += row['quantity']
+                if portions:
+                    OutboxEvent.objects.using(self.db).create(
+                        topic='order.cancelled', payload={'meals': portions}
+                    )
+        return order_ids
+    
+    def complete(self):
+        """Complete these orders; returns the changed ids."""
+        return self.transition('completed')
+    
+    def cancel(self):
+        """Cancel these orders; returns the changed ids."""
+        return self.transition('cancelled')
 
 
 class Order(models.Model):
@@ -9,10 +73,20 @@ class Order(models.Model):
     
     STATUS_CHOICES = [
         ('pending', 'Pending'),
+        ('confirmed', 'Confirmed'),
+        ('ready', 'Ready for Pickup'),
         ('completed', 'Completed'),
         ('cancelled', 'Cancelled'),
     ]
     
+    # Statuses an order may move to, and the statuses it may move from
+    ALLOWED_TRANSITIONS = {
+        'confirmed': ['pending'],
+        'ready': ['pending', 'confirmed'],
+        'completed': ['pending', 'confirmed', 'ready'],
+        'cancelled': ['pending', 'confirmed'],
+    }
+    
     DELIVERY_TYPE_CHOICES = [
         ('pickup', 'Pickup'),
         ('delivery', 'Delivery'),
@@ -23,14 +97,16 @@ class Order(models.Model):
         ('cash', 'Cash on Delivery/Pickup'),
     ]
     
+    # Indexed by order_customer_status_idx, which leads with customer
     customer = models.ForeignKey(
-        CustomerProfile, on_delete=models.CASCADE, related_name='orders'
+        CustomerProfile, on_delete=models.CASCADE, related_name='orders', db_index=False
     )
     meal = models.ForeignKey(
         Meal, on_delete=models.CASCADE, related_name='orders'
     )
+    # Indexed by order_cook_status_idx, which leads with cook
     cook = models.ForeignKey(
-        CookProfile, on_delete=models.CASCADE, related_name='received_orders'
+        CookProfile, on_delete=models.CASCADE, related_name='received_orders', db_index=False
     )
     quantity = models.PositiveIntegerField(default=1)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
@@ -50,8 +126,15 @@ class Order(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = OrderQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Dashboard and order list filters: (cook|customer, status), newest first
+            models.Index(fields=['cook', 'status', '-created_at'], name='order_cook_status_idx'),
+            models.Index(fields=['customer', 'status', '-created_at'], name='order_customer_status_idx'),
+        ]
     
     def __str__(self):
         return f"Order #{self.pk} - {self.meal.name} by {self.customer.user.username}"
@@ -67,31 +150,94 @@ class Order(models.Model):
         return self.total_price
     
     def mark_as_completed(self):
-        """Mark order as completed."""
+        """Mark order as completed; the cook is credited by the outbox worker."""
         if self.status == 'pending':
-            self.status = 'completed'
-            self.cook.total_orders += 1
-            self.cook.save()
-            self.save()
-            return True
+            completed = Order.objects.filter(pk=self.pk, status='pending').complete()
+            self.refresh_from_db(fields=['status', 'updated_at'])
+            return bool(completed)
         return False
     
     def cancel(self):
-        """Cancel the order and restore meal quantity."""
+        """Cancel the order; the outbox worker restores meal quantity."""
         if self.status == 'pending':
-            self.status = 'cancelled'
-            # Restore quantity only if it's not a dine-in order
-            if self.delivery_type != 'dine_in':
-                self.meal.quantity_available += self.quantity
-                # Reactivate meal if it was sold out
-                if not self.meal.is_active and self.meal.quantity_available > 0:
-                    self.meal.is_active = True
-                self.meal.save()
-            self.save()
-            return True
+            cancelled = Order.objects.filter(pk=self.pk, status='pending').cancel()
+            self.refresh_from_db(fields=['status', 'updated_at'])
+            return bool(cancelled)
         return False
     
     @property
     def can_be_rated(self):
         """Check if order can be rated."""
         return self.status == 'completed' and not hasattr(self, 'rating_detail')
+
+
+class IdempotencyKeyQuerySet(models.QuerySet):
+    
+    def expired(self):
+        """Keys older than IDEMPOTENCY_KEY_TTL_HOURS, which no longer replay."""
+        ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        return self.filter(created_at__lt=timezone.now() - ttl)
+
+
+class IdempotencyKey(models.Model):
+    """First response to an order-creating request sent with an Idempotency-Key header."""
+    
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='idempotency_keys'
+    )
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(
+        max_length=64, help_text='SHA-256 of the request method, path and body'
+    )
+    response_status = models.PositiveSmallIntegerField(
+        null=True, blank=True, help_text='Empty while the first request is still running'
+    )
+    response_body = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    objects = IdempotencyKeyQuerySet.as_manager()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
+        indexes = [
+            # Range scans for purge_idempotency_keys
+            models.Index(fields=['created_at'], name='idempotency_key_created_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.key} ({self.user})"
+    
+    @property
+    def is_expired(self):
+        ttl = timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+        return self.created_at < timezone.now() - ttl
+
+
+class OutboxEvent(models.Model):
+    """Follow-up work recorded in the same transaction as an order change."""
+    
+    TOPIC_CHOICES = [
+        ('order.completed', 'Orders completed'),
+        ('order.cancelled', 'Orders cancelled'),
+    ]
+    
+    topic = models.CharField(max_length=50, choices=TOPIC_CHOICES)
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['id'], name='outbox_pending_idx',
+                condition=models.Q(processed_at__isnull=True)
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.topic} #{self.pk}"
@@ -0,0 +1,118 @@
+"""
+Transactional outbox for order side effects.
+
+OrderQuerySet.transition records an OutboxEvent in the same transaction as
+the status change, and ``python manage.py process_outbox --loop`` (the
+worker process of every deploy) applies it off the request path; events
+whose handler fails stay pending and are retried. Each batch is
+split by topic and the events of a topic are coalesced, so many
+completions for one cook become a single ``total_orders`` update and many
+cancellations of one meal a single restock. Topics run in parallel on a
+thread pool; every chunk claims its events with ``SKIP LOCKED`` and marks
+them processed in the same transaction as its writes, so concurrent
+workers never apply an event twice.
+"""
+import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection, models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import CookProfile
+from meals.models import Meal
+from .models import OutboxEvent
+
+
+logger = logging.getLogger(__name__)
+
+
+def _sum_payloads(events, key):
+    totals = Counter()
+    for event in events:
+        for object_id, count in event.payload[key].items():
+            totals[int(object_id)] += count
+    return totals
+
+
+def credit_cooks(events):
+    """order.completed: add completed orders to each cook's total_orders."""
+    completed = _sum_payloads(events, 'cooks')
+    CookProfile.objects.filter(pk__in=completed).update(
+        total_orders=F('total_orders') + models.Case(
+            *(models.When(pk=cook_id, then=models.Value(count)) for cook_id, count in completed.items()),
+            output_field=models.IntegerField()
+        )
+    )
+
+
+def restock_meals(events):
+    """order.cancelled: return cancelled portions to stock."""
+    Meal.objects.restock(_sum_payloads(events, 'meals'))
+
+
+HANDLERS = {
+    'order.completed': credit_cooks,
+    'order.cancelled': restock_meals,
+}
+
+
+def _apply(topic, event_ids):
+    """Apply one topic's events; returns (processed, failed) counts."""
+    try:
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True)
+                .filter(pk__in=event_ids, processed_at__isnull=True)
+            )
+            if events:
+                HANDLERS[topic](events)
+                OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+                    processed_at=timezone.now(), attempts=F('attempts') + 1, last_error=''
+                )
+        return len(events), 0
+    except Exception as exc:
+        logger.exception('Outbox %s events %s failed', topic, event_ids)
+        OutboxEvent.objects.filter(pk__in=event_ids, processed_at__isnull=True).update(
+            attempts=F('attempts') + 1, last_error=repr(exc)
+        )
+        return 0, len(event_ids)
+
+
+def _process_chunk(topic, event_ids):
+    try:
+        return _apply(topic, event_ids)
+    finally:
+        # Worker threads each hold their own connection
+        connection.close()
+
+
+def process_batch(batch_size=500, workers=4, chunk_size=100, max_attempts=5):
+    """
+    Drain up to ``batch_size`` pending events; returns (processed, failed).
+
+    Events that have failed ``max_attempts`` times are left for inspection.
+    """
+    pending = list(
+        OutboxEvent.objects.filter(processed_at__isnull=True, attempts__lt=max_attempts)
+        .order_by('pk').values_list('pk', 'topic')[:batch_size]
+    )
+    by_topic = defaultdict(list)
+    for event_id, topic in pending:
+        if topic in HANDLERS:
+            by_topic[topic].append(event_id)
+        else:
+            logger.error('No outbox handler for topic %s (event %s)', topic, event_id)
+
+    chunks = [
+        (topic, event_ids[start:start + chunk_size])
+        for topic, event_ids in by_topic.items()
+        for start in range(0, len(event_ids), chunk_size)
+    ]
+    if not chunks:
+        return 0, 0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda chunk: _process_chunk(*chunk), chunks))
+    return sum(result[0] for result in results), sum(result[1] for result in results)
@@ -40,6 +40,22 @@ class OrderSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class OrderListSerializer(serializers.ModelSerializer):
+    """Flat order summary for list endpoints; the detail view keeps OrderSerializer."""
+    customer_name = serializers.CharField(source='customer.user.get_full_name', read_only=True)
+    meal_name = serializers.CharField(source='meal.name', read_only=True)
+    meal_photo = serializers.ImageField(source='meal.photo', read_only=True)
+    cook_name = serializers.CharField(source='cook.user.get_full_name', read_only=True)
+
+    class Meta:
+        model = Order
+        fields = [
+            'id', 'customer_name', 'meal', 'meal_name', 'meal_photo', 'cook', 'cook_name',
+            'quantity', 'total_price', 'status', 'delivery_type', 'rating', 'created_at'
+        ]
+        read_only_fields = fields
+
+
 class OrderCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
@@ -58,3 +74,28 @@ class OrderCreateSerializer(serializers.ModelSerializer):
                 validated_data['cook'] = meal.cook
                 validated_data['customer_phone'] = request.user.phone
         return super().create(validated_data)
+
+
+class CheckoutItemSerializer(serializers.Serializer):
+    meal = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1)
+    delivery_type = serializers.ChoiceField(choices=Order.DELIVERY_TYPE_CHOICES, default='pickup')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class CheckoutSerializer(serializers.Serializer):
+    """Cart checkout: every item becomes one order, all placed together."""
+    
+    MAX_ITEMS = 20
+    
+    items = CheckoutItemSerializer(many=True, allow_empty=False, max_length=MAX_ITEMS)
+    payment_method = serializers.ChoiceField(choices=Order.PAYMENT_METHOD_CHOICES, default='cash')
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    MAX_IDS = 200
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_IDS
+    )
+    status = serializers.ChoiceField(choices=list(Order.ALLOWED_TRANSITIONS))
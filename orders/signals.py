@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .events import publish_orders_created, publish_status_changed
+from .models import Order
+
+
+@receiver(post_save, sender=Order)
+def publish_order_event(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Push new orders and status changes to the cook's dashboard stream."""
+    if raw:
+        return
+    if created:
+        publish_orders_created([instance])
+    elif update_fields is None or 'status' in update_fields:
+        publish_status_changed([(instance.pk, instance.cook_id)], instance.status, instance.updated_at)
@@ -1,3 +1,402 @@
-from django.test import TestCase
+import json
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from homebite.testing import create_cook, create_customer, create_meal
+from meals.models import Meal
+from .models import IdempotencyKey, Order, OutboxEvent
+from .outbox import HANDLERS, process_batch
+
+
+class ConcurrentOrderPlacementTests(TransactionTestCase):
+    """Parallel orders must never take more portions than a meal has."""
+
+    STOCK = 10
+    CUSTOMERS = 24
+
+    def setUp(self):
+        self.meal = create_meal(create_cook(), quantity_available=self.STOCK)
+        self.customers = [create_customer(f'customer{index}').user for index in range(self.CUSTOMERS)]
+
+    def _place_orders_in_parallel(self, quantity):
+        barrier = threading.Barrier(len(self.customers))
+        statuses = []
+        lock = threading.Lock()
+
+        def place(user):
+            client = APIClient(SERVER_NAME='localhost')
+            client.force_authenticate(user)
+            try:
+                barrier.wait()
+                response = client.post(
+                    '/api/orders/',
+                    {'meal': self.meal.pk, 'quantity': quantity, 'delivery_type': 'pickup'},
+                    format='json'
+                )
+                with lock:
+                    statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=place, args=(user,)) for user in self.customers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return statuses
+
+    def test_no_overselling_single_portions(self):
+        statuses = self._place_orders_in_parallel(quantity=1)
+
+        self.meal.refresh_from_db()
+        self.assertEqual(statuses.count(201), self.STOCK)
+        self.assertEqual(statuses.count(400), self.CUSTOMERS - self.STOCK)
+        self.assertEqual(self.meal.quantity_available, 0)
+        self.assertFalse(self.meal.is_active)
+        self.assertEqual(Order.objects.filter(meal=self.meal).count(), self.STOCK)
+
+    def test_no_overselling_multiple_portions(self):
+        statuses = self._place_orders_in_parallel(quantity=3)
+
+        self.meal.refresh_from_db()
+        ordered = sum(Order.objects.filter(meal=self.meal).values_list('quantity', flat=True))
+        self.assertEqual(statuses.count(201), self.STOCK // 3)
+        self.assertEqual(ordered, self.STOCK - self.STOCK % 3)
+        self.assertEqual(self.meal.quantity_available, self.STOCK % 3)
+        self.assertTrue(self.meal.is_active)
+
+
+@override_settings(STREAM_CHUNK_SIZE=2)
+class OrderHistoryStreamTests(TestCase):
+    """?stream=true returns the paginated results as one array, under WSGI and ASGI."""
+
+    URL = '/api/orders/history/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cook = create_cook()
+        meal = create_meal(cook, 'Haleem', price=200, quantity_available=50)
+        customer = create_customer()
+        cls.customer_user = customer.user
+        Order.objects.bulk_create(
+            Order(
+                customer=customer, meal=meal, cook=cook, quantity=1, total_price=200,
+                customer_phone='03001234567'
+            )
+            for _ in range(5)
+        )
+
+    def _paginated_results(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.customer_user)
+        return client.get(self.URL, {'page_size': 100}).json()['results']
+
+    def test_wsgi_stream_matches_paginated_results(self):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.customer_user)
+        response = client.get(self.URL, {'stream': 'true'})
+        self.assertFalse(response.is_async)
+        self.assertEqual(json.loads(b''.join(response.streaming_content)), self._paginated_results())
+
+    async def test_asgi_stream_matches_paginated_results(self):
+        await self.async_client.aforce_login(self.customer_user)
+        response = await self.async_client.get(self.URL, {'stream': 'true'})
+        self.assertTrue(response.is_async)
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(
+            json.loads(body), await sync_to_async(self._paginated_results)()
+        )
+
+
+class CheckoutTests(TestCase):
+    """A cart becomes one order per item, placed all together or not at all."""
+
+    def setUp(self):
+        self.biryani = create_meal(create_cook('cook1'), quantity_available=5)
+        self.nihari = create_meal(
+            create_cook('cook2'), 'Nihari', price=300, quantity_available=2,
+            dine_with_us_available=True, dine_price=350
+        )
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(create_customer(phone='03001234567').user)
+
+    def _checkout(self, *items):
+        return self.client.post('/api/orders/checkout/', {'items': list(items)}, format='json')
+
+    def _stock(self):
+        return dict(Meal.objects.values_list('pk', 'quantity_available'))
+
+    def test_cart_places_one_order_per_item(self):
+        response = self._checkout(
+            {'meal': self.biryani.pk, 'quantity': 2},
+            {'meal': self.nihari.pk, 'quantity': 1, 'delivery_type': 'delivery'},
+            {'meal': self.nihari.pk, 'quantity': 3, 'delivery_type': 'dine_in'},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['total_price'], '1850.00')
+        self.assertEqual(
+            [(order['meal'], order['quantity']) for order in response.data['orders']],
+            [(self.biryani.pk, 2), (self.nihari.pk, 1), (self.nihari.pk, 3)]
+        )
+        self.assertEqual(Order.objects.filter(status='pending').count(), 3)
+        self.assertEqual(
+            set(Order.objects.values_list('cook', flat=True)), {self.biryani.cook_id, self.nihari.cook_id}
+        )
+        # Dine-in portions do not come out of stock
+        self.assertEqual(self._stock(), {self.biryani.pk: 3, self.nihari.pk: 1})
+
+    def test_cart_over_stock_places_nothing(self):
+        response = self._checkout(
+            {'meal': self.biryani.pk, 'quantity': 2},
+            {'meal': self.nihari.pk, 'quantity': 2},
+            {'meal': self.nihari.pk, 'quantity': 1},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['items'][0], {})
+        self.assertIn('requests 3', str(response.data['items'][1]['quantity']))
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self._stock(), {self.biryani.pk: 5, self.nihari.pk: 2})
+
+    def test_unavailable_meal_places_nothing(self):
+        Meal.objects.filter(pk=self.nihari.pk).update(is_approved=False)
+        response = self._checkout(
+            {'meal': self.biryani.pk, 'quantity': 1},
+            {'meal': self.nihari.pk, 'quantity': 1},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('meal', response.data['items'][1])
+        self.assertFalse(Order.objects.exists())
+
+    def test_cooks_cannot_check_out(self):
+        self.client.force_authenticate(self.biryani.cook.user)
+        response = self._checkout({'meal': self.nihari.pk, 'quantity': 1})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Order.objects.exists())
+
+
+class BulkStatusTests(TestCase):
+    """Cooks move many orders at once; each id reports what happened to it."""
+
+    URL = '/api/orders/bulk-status/'
+
+    def setUp(self):
+        self.cook = create_cook()
+        meal = create_meal(self.cook, quantity_available=50)
+        other_cook = create_cook('other_cook')
+        other_meal = create_meal(other_cook, 'Nihari')
+        customer = create_customer()
+
+        def order(meal, cook, status):
+            return Order.objects.create(
+                customer=customer, meal=meal, cook=cook, quantity=1, total_price=250,
+                status=status, customer_phone='03001234567'
+            )
+
+        self.pending = [order(meal, self.cook, 'pending') for _ in range(3)]
+        self.completed = order(meal, self.cook, 'completed')
+        self.not_mine = order(other_meal, other_cook, 'pending')
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(self.cook.user)
+
+    def test_reports_a_result_per_id(self):
+        ids = [order.pk for order in self.pending] + [self.pending[0].pk, self.completed.pk, self.not_mine.pk]
+        response = self.client.post(self.URL, {'ids': ids, 'status': 'confirmed'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+        self.assertEqual(response.data['results'], [
+            *({'id': order.pk, 'result': 'updated', 'status': 'confirmed'} for order in self.pending),
+            {'id': self.completed.pk, 'result': 'invalid_transition', 'status': 'completed'},
+            {'id': self.not_mine.pk, 'result': 'not_found', 'status': None},
+        ])
+        self.not_mine.refresh_from_db()
+        self.assertEqual(self.not_mine.status, 'pending')
+
+    def test_query_count_does_not_grow_with_orders(self):
+        query_counts = []
+        for orders in (self.pending[:1], self.pending[1:]):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(
+                    self.URL, {'ids': [order.pk for order in orders], 'status': 'confirmed'}, format='json'
+                )
+            self.assertEqual(response.data['updated'], len(orders))
+            query_counts.append(len(queries.captured_queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_rejects_customers_and_unknown_statuses(self):
+        response = self.client.post(self.URL, {'ids': [self.pending[0].pk], 'status': 'pending'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.pending[0].customer.user)
+        response = self.client.post(self.URL, {'ids': [self.pending[0].pk], 'status': 'confirmed'}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Order.objects.filter(status='confirmed').exists())
+
+
+class IdempotencyKeyTests(TransactionTestCase):
+    """Requests sharing an Idempotency-Key place at most one order."""
+
+    def setUp(self):
+        self.meal = create_meal(create_cook(), 'Nihari', price=300)
+        self.customer = create_customer().user
+
+    def _post(self, quantity=1, key='order-1'):
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(self.customer)
+        return client.post(
+            '/api/orders/',
+            {'meal': self.meal.pk, 'quantity': quantity, 'delivery_type': 'pickup'},
+            format='json', HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self._post()
+        retry = self._post()
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.meal.refresh_from_db()
+        self.assertEqual(self.meal.quantity_available, 9)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_key_reused_for_a_different_request_is_rejected(self):
+        self.assertEqual(self._post(quantity=1).status_code, 201)
+        response = self._post(quantity=2)
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_releases_the_key(self):
+        self.assertEqual(self._post(quantity=11).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.assertEqual(self._post(quantity=1).status_code, 201)
+
+    def test_purge_deletes_only_expired_keys(self):
+        self.assertEqual(self._post(key='old').status_code, 201)
+        self.assertEqual(self._post(key='new').status_code, 201)
+        IdempotencyKey.objects.filter(key='old').update(
+            created_at=timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS + 1)
+        )
+
+        call_command('purge_idempotency_keys', stdout=StringIO())
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['new'])
+
+    def test_concurrent_duplicates_place_one_order(self):
+        attempts = 8
+        barrier = threading.Barrier(attempts)
+        responses = []
+        lock = threading.Lock()
+
+        def post():
+            try:
+                barrier.wait()
+                response = self._post()
+                with lock:
+                    responses.append(response)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([response.status_code for response in responses], [201] * attempts)
+        self.assertEqual(len({response.data['id'] for response in responses}), 1)
+        self.assertEqual(sum(response.has_header('Idempotent-Replayed') for response in responses), attempts - 1)
+        self.meal.refresh_from_db()
+        self.assertEqual(self.meal.quantity_available, 9)
+        self.assertEqual(Order.objects.count(), 1)
+
+
+class OutboxTests(TransactionTestCase):
+    """Completions credit cooks and cancellations restock meals, once, via the outbox."""
+
+    def setUp(self):
+        self.cook = create_cook()
+        self.meal = create_meal(self.cook, 'Haleem', price=200, quantity_available=5)
+        customer = create_customer()
+        self.orders = Order.objects.bulk_create(
+            Order(
+                customer=customer, meal=self.meal, cook=self.cook, quantity=2, total_price=400,
+                status='confirmed', customer_phone='03001234567'
+            )
+            for _ in range(4)
+        )
+
+    def _orders(self, orders):
+        return Order.objects.filter(pk__in=[order.pk for order in orders])
+
+    def test_events_wait_for_the_worker(self):
+        self._orders(self.orders[:3]).complete()
+        self._orders(self.orders[3:]).cancel()
+
+        # The request only records the events
+        self.cook.refresh_from_db()
+        self.meal.refresh_from_db()
+        self.assertEqual(self.cook.total_orders, 0)
+        self.assertEqual(self.meal.quantity_available, 5)
+        self.assertEqual(OutboxEvent.objects.filter(processed_at__isnull=True).count(), 2)
+
+        self.assertEqual(process_batch(workers=1), (2, 0))
+        self.assertEqual(process_batch(workers=1), (0, 0))
+        self.cook.refresh_from_db()
+        self.meal.refresh_from_db()
+        self.assertEqual(self.cook.total_orders, 3)
+        self.assertEqual(self.meal.quantity_available, 7)
+
+    def test_failed_event_is_retried_by_the_worker(self):
+        def fail(events):
+            raise RuntimeError('database went away')
+
+        self._orders(self.orders[:2]).complete()
+        with mock.patch.dict(HANDLERS, {'order.completed': fail}), self.assertLogs('orders.outbox', 'ERROR'):
+            self.assertEqual(process_batch(workers=2), (0, 1))
+
+        event = OutboxEvent.objects.get(topic='order.completed')
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertIn('database went away', event.last_error)
+        self.cook.refresh_from_db()
+        self.assertEqual(self.cook.total_orders, 0)
+
+        self.assertEqual(process_batch(workers=2), (1, 0))
+        self.assertEqual(process_batch(workers=2), (0, 0))
+        event.refresh_from_db()
+        self.cook.refresh_from_db()
+        self.assertIsNotNone(event.processed_at)
+        self.assertEqual(event.attempts, 2)
+        self.assertEqual(self.cook.total_orders, 2)
+
+    def test_worker_coalesces_pending_events(self):
+        self._orders(self.orders[:1]).complete()
+        self._orders(self.orders[1:2]).complete()
+        self._orders(self.orders[2:3]).cancel()
+        self._orders(self.orders[3:]).cancel()
+        self.assertEqual(OutboxEvent.objects.filter(processed_at__isnull=True).count(), 4)
+
+        self.assertEqual(process_batch(workers=2), (4, 0))
+        self.cook.refresh_from_db()
+        self.meal.refresh_from_db()
+        self.assertEqual(self.cook.total_orders, 2)
+        self.assertEqual(self.meal.quantity_available, 9)
+        self.assertTrue(self.meal.is_active)
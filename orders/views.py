@@ -2,6 +2,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import HttpResponseForbidden
+from django.db import transaction
 from .models import Order
 from .forms import PlaceOrderForm, OrderRatingForm
 from meals.models import Meal
@@ -32,26 +33,24 @@ def place_order(request, meal_id):
         if form.is_valid():
             quantity = form.cleaned_data['quantity']
             
-            # Check availability again
-            if quantity > meal.quantity_available:
-                messages.error(request, 'Not enough quantity available.')
-                return redirect('meals:detail', pk=meal_id)
-            
-            # Create order
-            order = Order.objects.create(
-                customer=profile,
-                meal=meal,
-                cook=meal.cook,
-                quantity=quantity,
-                delivery_type=form.cleaned_data['delivery_type'],
-                customer_phone=form.cleaned_data['customer_phone'],
-                notes=form.cleaned_data.get('notes', ''),
-                total_price=meal.price * quantity,
-                status='pending'
-            )
-            
-            # Reduce meal quantity
-            meal.reduce_quantity(quantity)
+            with transaction.atomic():
+                # Take the portions first; fails instead of overselling
+                if not meal.reduce_quantity(quantity):
+                    messages.error(request, 'Not enough quantity available.')
+                    return redirect('meals:detail', pk=meal_id)
+                
+                # Create order
+                order = Order.objects.create(
+                    customer=profile,
+                    meal=meal,
+                    cook=meal.cook,
+                    quantity=quantity,
+                    delivery_type=form.cleaned_data['delivery_type'],
+                    customer_phone=form.cleaned_data['customer_phone'],
+                    notes=form.cleaned_data.get('notes', ''),
+                    total_price=meal.price * quantity,
+                    status='pending'
+                )
             
             messages.success(request, 'Order placed successfully!')
             return redirect('orders:confirmation', pk=order.pk)
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from accounts.models import CustomerProfile, CookProfile
 from meals.models import Meal
@@ -50,20 +50,25 @@ class Rating(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['customer', 'order']  # One rating per order per customer
+        indexes = [
+            models.Index(fields=['cook', '-created_at'], name='rating_cook_created_idx'),
+            models.Index(fields=['customer', '-created_at'], name='rating_customer_created_idx'),
+        ]
     
     def __str__(self):
         return f"Rating by {self.customer.user.username} for Order #{self.order.pk}"
     
     def save(self, *args, **kwargs):
-        """Update cook's average rating when a new rating is saved."""
+        """Update the cook's average rating when a rating is first saved."""
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        if is_new:
-            # Update cook's average rating
-            self.cook.update_rating(self.cook_rating)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
             
-            # Update order rating field for backward compatibility
-            self.order.rating = self.meal_rating
-            self.order.review = self.comment
-            self.order.save(update_fields=['rating', 'review'])
+            if is_new:
+                # Update cook's average rating
+                self.cook.update_rating(self.cook_rating)
+                
+                # Update order rating field for backward compatibility
+                self.order.rating = self.meal_rating
+                self.order.review = self.comment
+                self.order.save(update_fields=['rating', 'review'])
@@ -0,0 +1,54 @@
+"""
+Keep Meal.rating_sum/rating_count in step with the ratings table.
+
+Receivers rather than Rating.save/delete overrides, so queryset deletes and
+cascades from deleting an order, meal or account are counted too.
+"""
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from meals.models import Meal
+from .models import Rating
+
+
+def _add_to_meal(meal_id, rating_sum, rating_count, using):
+    Meal.objects.using(using).filter(pk=meal_id).update(
+        rating_sum=F('rating_sum') + rating_sum,
+        rating_count=F('rating_count') + rating_count,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(pre_save, sender=Rating)
+def remember_meal_rating(sender, instance, raw=False, using=None, **kwargs):
+    """Keep the stored meal and score an update is about to replace."""
+    instance._meal_rating_previous = None
+    if raw or instance._state.adding:
+        return
+    instance._meal_rating_previous = Rating.objects.using(using).filter(pk=instance.pk).values_list(
+        'meal_id', 'meal_rating'
+    ).first()
+
+
+@receiver(post_save, sender=Rating)
+def count_meal_rating(sender, instance, created, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_meal_rating_previous', None)
+    if previous == (instance.meal_id, instance.meal_rating):
+        return
+    if previous is None:
+        if created:
+            _add_to_meal(instance.meal_id, instance.meal_rating, 1, using)
+    elif previous[0] == instance.meal_id:
+        _add_to_meal(instance.meal_id, instance.meal_rating - previous[1], 0, using)
+    else:
+        _add_to_meal(previous[0], -previous[1], -1, using)
+        _add_to_meal(instance.meal_id, instance.meal_rating, 1, using)
+
+
+@receiver(post_delete, sender=Rating)
+def uncount_meal_rating(sender, instance, using=None, **kwargs):
+    _add_to_meal(instance.meal_id, -instance.meal_rating, -1, using)